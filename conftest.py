@@ -1,9 +1,103 @@
+# Standard Libary
+import json
+from types import SimpleNamespace
+
 # Django
+from django.core.cache import cache
 from django.test.client import Client
 
 # First-Party
+import cloudinary.uploader
 import pytest
+from app.factories import RecipientFactory
 from app.factories import UserFactory
+from app.factories import VolunteerFactory
+from app.models import Recipient
+from app.models import User
+from app.models import Volunteer
+from rq import Queue
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--bench-report',
+        default=None,
+        help='Write benchmark query counts and timings to this JSON file.',
+    )
+
+
+@pytest.fixture(autouse=True)
+def media_storage(settings, tmp_path):
+    """
+    Keeps uploads on the local filesystem instead of Cloudinary.
+    """
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Empties the cache around each test.
+
+    Hashids repeat from run to run as the test database's sequences
+    restart, so cached fragments and user versions would otherwise
+    outlive the rows they were keyed on.
+    """
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def raw_uploads(monkeypatch):
+    """
+    Stands in for Cloudinary's raw storage, keeping uploads in memory by
+    public id; deleted uploads are left as None.
+    """
+    uploads = {}
+
+    def upload(file, **options):
+        assert options['resource_type'] == 'raw'
+        public_id = f"{options['folder']}/{file.name}"
+        uploads[public_id] = file.read()
+        return {'public_id': public_id}
+
+    def destroy(public_id, **options):
+        found = uploads.get(public_id) is not None
+        uploads[public_id] = None
+        return {'result': 'ok' if found else 'not found'}
+
+    def get(url, **kwargs):
+        for public_id, content in uploads.items():
+            if content is not None and url.endswith(f'/{public_id}'):
+                return SimpleNamespace(
+                    status_code=200,
+                    content=content,
+                    raise_for_status=lambda: None,
+                )
+        return SimpleNamespace(status_code=404)
+
+    monkeypatch.setattr(cloudinary.uploader, 'upload', upload)
+    monkeypatch.setattr(cloudinary.uploader, 'destroy', destroy)
+    monkeypatch.setattr('cloudinary_storage.storage.requests.get', get)
+    return uploads
+
+
+@pytest.fixture(autouse=True)
+def rq_sync(monkeypatch):
+    """
+    Runs rq jobs as they are enqueued instead of leaving them for a worker.
+    """
+    enqueue_job = Queue.enqueue_job
+
+    def enqueue_sync(queue, *args, **kwargs):
+        # Job decorators hold their queue from import, so each queue is
+        # switched as it is used rather than through settings.
+        monkeypatch.setattr(queue, '_is_async', False)
+        return enqueue_job(queue, *args, **kwargs)
+
+    monkeypatch.setattr(Queue, 'enqueue_job', enqueue_sync)
 
 
 @pytest.fixture
@@ -38,3 +132,33 @@ def admin_client():
     client = Client()
     client.force_login(admin)
     return client
+
+
+@pytest.fixture(scope='session')
+def bench_report(request):
+    results = {}
+    yield results
+    path = request.config.getoption('--bench-report')
+    if path:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+
+@pytest.fixture
+def seeded(db):
+    """
+    Event-day volumes: every user signed up, half the groups assigned.
+    """
+    users = User.objects.bulk_create(
+        UserFactory.build_batch(300),
+    )
+    recipients = Recipient.objects.bulk_create([
+        RecipientFactory.build(user=user) for user in users[:150]
+    ])
+    Volunteer.objects.bulk_create([
+        VolunteerFactory.build(
+            user=user,
+            assignment=recipients[i] if i % 2 else None,
+        ) for i, user in enumerate(users[150:])
+    ])
+    Recipient.objects.update_counts()
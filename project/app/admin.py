@@ -4,18 +4,52 @@ from address.forms import AddressWidget
 from address.models import AddressField
 from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
 from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.admin.views.main import ORDER_VAR
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as UserAdminBase
+from django.http import Http404
+from django.http import JsonResponse
 from django.utils.safestring import mark_safe
 
 # Local
+from .assign import assign_volunteers
 from .forms import UserChangeForm
 from .forms import UserCreationForm
+from .forms import VolunteerChangeListForm
 from .inlines import VolunteerInline
 from .models import Picture
 from .models import Recipient
 from .models import User
 from .models import Volunteer
+from .paginators import EstimatedPaginator
+from .search import search
+from .tasks import queue_bulk_email
+from .widgets import AssignmentSelect
+from .widgets import label_recipient
+
+
+class SearchChangeList(ChangeList):
+    def get_ordering(self, request, queryset):
+        # Searches list the best matches first unless a column is sorted.
+        if self.query and ORDER_VAR not in self.params:
+            return self._get_deterministic_ordering(list(queryset.query.order_by))
+        return super().get_ordering(request, queryset)
+
+
+class SearchMixin(object):
+    """
+    Searches `search_fields` through the trigram indexes, ranked.
+    """
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        fields = self.get_search_fields(request)
+        return search(queryset, search_term, fields), False
+
+    def get_changelist(self, request, **kwargs):
+        return SearchChangeList
 
 
 @admin.register(Picture)
@@ -25,9 +59,34 @@ class PictureAdmin(admin.ModelAdmin):
         'image',
     ]
 
+class RecipientAutocompleteJsonView(AutocompleteJsonView):
+    """
+    Autocomplete results labelled with the headcount still needed.
+    """
+    def get(self, request, *args, **kwargs):
+        if not self.model_admin.get_search_fields(request):
+            raise Http404(
+                f'{type(self.model_admin).__name__} must have search_fields for the autocomplete_view.'
+            )
+        if not self.has_perm(request):
+            return JsonResponse({'error': '403 Forbidden'}, status=403)
+        self.term = request.GET.get('term', '')
+        self.object_list = self.get_queryset()
+        context = self.get_context_data()
+        return JsonResponse({
+            'results': [
+                {'id': str(obj.pk), 'text': label_recipient(obj)}
+                for obj in context['object_list']
+            ],
+            'pagination': {'more': context['page_obj'].has_next()},
+        })
+
+
 @admin.register(Recipient)
-class RecipientAdmin(admin.ModelAdmin):
+class RecipientAdmin(SearchMixin, admin.ModelAdmin):
     save_on_top = True
+    paginator = EstimatedPaginator
+    show_full_result_count = False
     fields = [
         'name',
         'phone',
@@ -54,7 +113,10 @@ class RecipientAdmin(admin.ModelAdmin):
         # 'is_verified',
         # 'is_waiver',
         # 'created',
-        'total',
+        'head_count',
+    ]
+    list_select_related = [
+        'address__locality__state__country',
     ]
     list_editable = [
         # 'bags',
@@ -69,6 +131,9 @@ class RecipientAdmin(admin.ModelAdmin):
     ]
     search_fields = [
         'name',
+        'email',
+        'phone',
+        'address__raw',
     ]
     autocomplete_fields = [
         'user',
@@ -81,9 +146,13 @@ class RecipientAdmin(admin.ModelAdmin):
         'first_name',
     ]
     readonly_fields = [
-        'total',
+        'group_count',
+        'head_count',
         # 'reps',
     ]
+    actions = [
+        'send_confirmation',
+    ]
     formfield_overrides = {
         AddressField: {
             'widget': AddressWidget(
@@ -94,10 +163,29 @@ class RecipientAdmin(admin.ModelAdmin):
         }
     }
 
+    def send_confirmation(self, request, queryset):
+        ids = [str(pk) for pk in queryset.values_list('pk', flat=True)]
+        queue_bulk_email(
+            'recipient',
+            ids,
+            'app/emails/recipient_confirmation.txt',
+            'Rake Up Eagle Recipient Confirmation',
+        )
+        self.message_user(
+            request,
+            f"Queued {len(ids)} emails.",
+        )
+    send_confirmation.short_description = 'Email confirmation to selected recipients'
+
+    def autocomplete_view(self, request):
+        return RecipientAutocompleteJsonView.as_view(model_admin=self)(request)
+
 
 @admin.register(Volunteer)
-class VolunteerAdmin(admin.ModelAdmin):
+class VolunteerAdmin(SearchMixin, admin.ModelAdmin):
     save_on_top = True
+    paginator = EstimatedPaginator
+    show_full_result_count = False
     fields = [
         'name',
         'phone',
@@ -121,12 +209,19 @@ class VolunteerAdmin(admin.ModelAdmin):
     ]
     search_fields = [
         'name',
+        'email',
+        'phone',
+    ]
+    list_select_related = [
+        'user',
+        'assignment',
     ]
     list_editable = [
         'assignment',
     ]
     autocomplete_fields = [
         'user',
+        'assignment',
     ]
     inlines = [
     ]
@@ -136,11 +231,80 @@ class VolunteerAdmin(admin.ModelAdmin):
     ]
     readonly_fields = [
     ]
+    actions = [
+        'assign',
+        'assign_nearest',
+        'send_confirmation',
+        'send_assignment',
+    ]
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'assignment':
+            kwargs['widget'] = AssignmentSelect(
+                db_field.remote_field,
+                self.admin_site,
+                using=kwargs.get('using'),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs.setdefault('form', VolunteerChangeListForm)
+        return super().get_changelist_form(request, **kwargs)
+
+    def assign(self, request, queryset):
+        pairs = assign_volunteers(queryset)
+        self.message_user(
+            request,
+            f"Made {len(pairs)} assignments.",
+        )
+    assign.short_description = 'Assign selected volunteers'
+
+    def assign_nearest(self, request, queryset):
+        pairs = assign_volunteers(queryset, mode='nearest')
+        self.message_user(
+            request,
+            f"Made {len(pairs)} assignments.",
+        )
+    assign_nearest.short_description = 'Assign selected volunteers nearby'
+
+    def send_confirmation(self, request, queryset):
+        ids = [str(pk) for pk in queryset.values_list('pk', flat=True)]
+        queue_bulk_email(
+            'volunteer',
+            ids,
+            'app/emails/volunteer_confirmation.txt',
+            'Rake Up Eagle Volunteer Confirmation',
+        )
+        self.message_user(
+            request,
+            f"Queued {len(ids)} emails.",
+        )
+    send_confirmation.short_description = 'Email confirmation to selected volunteers'
+
+    def send_assignment(self, request, queryset):
+        ids = [
+            str(pk) for pk in queryset.filter(
+                assignment__isnull=False,
+            ).values_list('pk', flat=True)
+        ]
+        queue_bulk_email(
+            'volunteer',
+            ids,
+            'app/emails/volunteer_assignment.txt',
+            'Rake Up Eagle Volunteer Assignment',
+        )
+        self.message_user(
+            request,
+            f"Queued {len(ids)} emails.",
+        )
+    send_assignment.short_description = 'Email assignment to selected volunteers'
 
 
 @admin.register(User)
-class UserAdmin(UserAdminBase):
+class UserAdmin(SearchMixin, UserAdminBase):
     save_on_top = True
+    paginator = EstimatedPaginator
+    show_full_result_count = False
     add_form = UserCreationForm
     form = UserChangeForm
     model = User
@@ -0,0 +1,206 @@
+# Standard Libary
+from collections import defaultdict
+from collections import deque
+
+# Django
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+# Local
+from .fragments import bump_versions
+from .geo import KDTree
+from .geo import distance
+from .models import Recipient
+from .models import Volunteer
+
+# Headcount a volunteer group brings when `number` is not known.
+CAPACITY = {
+    Volunteer.SIZE.xs: 2,
+    Volunteer.SIZE.small: 4,
+    Volunteer.SIZE.medium: 7,
+    Volunteer.SIZE.large: 12,
+    Volunteer.SIZE.xl: 15,
+}
+
+# Headcount needed to finish a yard in each bag band.
+DEMAND = {
+    Recipient.SIZE.small: 2,
+    Recipient.SIZE.medium: 5,
+    Recipient.SIZE.large: 10,
+}
+
+
+def get_capacity(volunteer):
+    if volunteer.number:
+        return volunteer.number
+    return CAPACITY.get(volunteer.size, 0)
+
+
+def get_demand(recipient):
+    return DEMAND.get(recipient.size, 0)
+
+
+def match(volunteers, recipients):
+    """
+    Pairs volunteers with recipients by capacity.
+
+    Largest yards are filled first, each with the smallest group that
+    can handle it; if no group is big enough the largest one left is
+    used.  Groups are bucketed by headcount so each lookup only walks
+    the handful of distinct capacities rather than every volunteer.
+    """
+    buckets = defaultdict(deque)
+    for volunteer in volunteers:
+        buckets[get_capacity(volunteer)].append(volunteer)
+    capacities = sorted(buckets)
+    pairs = []
+    for recipient in sorted(recipients, key=get_demand, reverse=True):
+        if not capacities:
+            break
+        demand = get_demand(recipient)
+        capacity = next(
+            (c for c in capacities if c >= demand),
+            capacities[-1],
+        )
+        bucket = buckets[capacity]
+        pairs.append((bucket.popleft(), recipient))
+        if not bucket:
+            capacities.remove(capacity)
+    return pairs
+
+
+def get_location(person):
+    address = person.address
+    if address is None or address.latitude is None or address.longitude is None:
+        return None
+    return (address.latitude, address.longitude)
+
+
+def match_nearest(volunteers, recipients, origin=None):
+    """
+    Pairs each volunteer with the closest recipient it has capacity for.
+
+    Groups start from their own address, or `origin` when they have
+    none.  Smaller groups pick first so larger yards are left for the
+    groups that can handle them.  Recipients are indexed in one tree per
+    yard size, so each pick is a few nearest lookups rather than a scan.
+    Anyone without coordinates falls back to the plain capacity `match`.
+    """
+    located = defaultdict(list)
+    unlocated = []
+    for recipient in recipients:
+        location = get_location(recipient)
+        if location:
+            located[get_demand(recipient)].append(location + (recipient,))
+        else:
+            unlocated.append(recipient)
+    trees = {
+        demand: KDTree(points) for demand, points in located.items()
+    }
+    pairs = []
+    leftover = []
+    for volunteer in sorted(volunteers, key=get_capacity):
+        start = get_location(volunteer) or origin
+        live = [tree for tree in trees.values() if len(tree)]
+        if not start or not live:
+            leftover.append(volunteer)
+            continue
+        capacity = get_capacity(volunteer)
+        fits = [
+            tree for demand, tree in trees.items()
+            if demand <= capacity and len(tree)
+        ]
+        best = None
+        for tree in fits or live:
+            point = tree.nearest(start[0], start[1])
+            d = distance(start[0], start[1], point[0], point[1])
+            if best is None or d < best[0]:
+                best = (d, tree, point)
+        _, tree, point = best
+        tree.remove(point)
+        pairs.append((volunteer, point[2]))
+    for tree in trees.values():
+        unlocated += [
+            point[2] for i, point in enumerate(tree.points)
+            if not tree.removed[i]
+        ]
+    pairs += match(leftover, unlocated)
+    return pairs
+
+
+def assign_volunteers(volunteers=None, reset=False, mode='capacity'):
+    """
+    Assigns unassigned volunteers to unassigned recipients.
+
+    Pass a `volunteers` queryset to restrict the run; `reset` clears
+    existing assignments first.  `mode` is 'capacity' or 'nearest'.
+    All writes happen in one transaction.  Returns the list of
+    (volunteer, recipient) pairs made.
+    """
+    if volunteers is None:
+        volunteers = Volunteer.objects.all()
+    with transaction.atomic():
+        cleared = set()
+        users = set()
+        if reset:
+            rows = volunteers.filter(
+                assignment__isnull=False,
+            ).values_list('assignment', 'user')
+            for assignment, user in rows:
+                cleared.add(assignment)
+                users.add(user)
+            volunteers.update(
+                assignment=None,
+                updated=timezone.now(),
+            )
+        volunteers = list(
+            volunteers.filter(
+                assignment__isnull=True,
+            ).select_related(
+                'address',
+            ).only(
+                'id',
+                'size',
+                'number',
+                'assignment',
+                'user',
+                'address__latitude',
+                'address__longitude',
+            ).select_for_update(
+                of=('self',),
+            )
+        )
+        recipients = Recipient.objects.filter(
+            assignments__isnull=True,
+        ).select_related(
+            'address',
+        ).only(
+            'id',
+            'size',
+            'address__latitude',
+            'address__longitude',
+        )
+        if mode == 'nearest':
+            pairs = match_nearest(
+                volunteers,
+                recipients,
+                origin=settings.ASSIGNMENT_ORIGIN,
+            )
+        else:
+            pairs = match(volunteers, recipients)
+        now = timezone.now()
+        for volunteer, recipient in pairs:
+            volunteer.assignment = recipient
+            volunteer.updated = now
+        Volunteer.objects.bulk_update(
+            [volunteer for volunteer, _ in pairs],
+            ['assignment', 'updated'],
+            batch_size=500,
+        )
+        # Bulk writes skip the volunteer signals; recount here instead.
+        Recipient.objects.filter(
+            pk__in=cleared | {recipient.pk for _, recipient in pairs},
+        ).update_counts()
+        bump_versions(*users, *(volunteer.user_id for volunteer, _ in pairs))
+    return pairs
@@ -1,32 +1,101 @@
+# Standard Libary
+import time
+
 # Django
 from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import transaction
 
 # Local
 from .models import User
 
+# Saves and deletes invalidate a cached user at once; the timeout only
+# bounds writes that skip the signals, like queryset updates.
+USER_TIMEOUT = 60 * 60
+
+
+def get_user_key(user_id):
+    return f'user:{user_id}'
+
+
+def get_user_version_key(user_id):
+    return f'user:{user_id}:version'
+
+
+def get_user_values(user):
+    # Hashids come back wrong from a pickle, so the row is cached as
+    # plain values with the pk as its integer.
+    values = {
+        field.attname: getattr(user, field.attname)
+        for field in User._meta.concrete_fields
+    }
+    values[User._meta.pk.attname] = int(user.pk)
+    return values
+
+
+def clear_user(user_id):
+    """
+    Invalidates the user's cached row once the transaction commits.
+
+    The row is cached with the version it was read under, so replacing
+    the version also discards a copy read before the commit but cached
+    after it.
+    """
+    key = get_user_version_key(user_id)
+    transaction.on_commit(lambda: cache.set(key, time.time_ns(), None))
+
 
 class Auth0Backend(ModelBackend):
 
-    def authenticate(self, request, **kwargs):
-        username = kwargs.get('username', None)
-        name = kwargs.get('name', '(Unknown)')
-        email = kwargs.get('email', None)
-        try:
-            user = User.objects.get(
-                username=username,
-            )
-        except User.DoesNotExist:
-            user = User(
-                username=username,
-                name=name,
-                email=email,
-            )
-            user.set_unusable_password()
-            user.save()
+    def authenticate(self, request, username=None, **kwargs):
+        """
+        Returns the Auth0 user, creating them on first login.
+
+        Name and email follow Auth0 but are only written when they
+        differ from the row on file, so most logins just read it.
+        """
+        fields = {
+            key: kwargs[key] for key in ('name', 'email') if kwargs.get(key)
+        }
+        user, created = User.objects.get_or_create(
+            username=username,
+            defaults={
+                'password': make_password(None),
+                **fields,
+            },
+        )
+        changed = [
+            key for key, value in fields.items()
+            if getattr(user, key) != value
+        ]
+        if changed:
+            for key in changed:
+                setattr(user, key, fields[key])
+            user.save(update_fields=changed + ['updated'])
         return user
 
     def get_user(self, user_id):
+        """
+        Loads the session's user from the cache, falling back to the
+        database.
+
+        A cached row counts only while its version is current, so one
+        read just before a save never outlives it.
+        """
+        key = get_user_key(user_id)
+        version_key = get_user_version_key(user_id)
+        cached = cache.get_many([key, version_key])
+        version = cached.get(version_key)
+        if version is None:
+            cache.add(version_key, time.time_ns(), None)
+            version = cache.get(version_key)
+        elif cached.get(key, (None,))[0] == version:
+            values = cached[key][1]
+            return User.from_db(User.objects.db, list(values), list(values.values()))
         try:
-            return User.objects.get(pk=user_id)
+            user = User.objects.get(pk=user_id)
         except User.DoesNotExist:
             return None
+        cache.set(key, (version, get_user_values(user)), USER_TIMEOUT)
+        return user
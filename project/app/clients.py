@@ -0,0 +1,58 @@
+# Standard Libary
+import logging
+from urllib.parse import urlparse
+
+# First-Party
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+log = logging.getLogger(__name__)
+
+
+class Session(requests.Session):
+    """
+    Keep-alive session with default timeouts, retries and timing.
+
+    Idempotent requests are retried with backoff on connection errors
+    and 429/5xx responses; POSTs are never retried since a token code
+    can only be exchanged once.  Each response is logged with its
+    endpoint and elapsed time.
+    """
+    timeout = (3.05, 10)
+
+    def __init__(self):
+        super().__init__()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=retry,
+        )
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.hooks['response'].append(self.record)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+    def record(self, response, *args, **kwargs):
+        # Drop ids from the path so timings group by endpoint.
+        path = urlparse(response.url).path
+        endpoint = '/'.join(path.split('/')[:4])
+        log.info(
+            "%s %s %s %.0fms",
+            response.request.method,
+            endpoint,
+            response.status_code,
+            response.elapsed.total_seconds() * 1000,
+        )
+
+
+auth0 = Session()
@@ -0,0 +1,100 @@
+# Standard Libary
+import csv
+
+# Django
+from django.contrib.postgres.aggregates import StringAgg
+from django.db.models import CharField
+from django.db.models import Value
+from django.db.models.functions import Cast
+from django.db.models.functions import Concat
+
+# Local
+from .models import Recipient
+from .models import Volunteer
+
+CHUNK_SIZE = 2000
+
+
+class Echo(object):
+    """
+    Pseudo-buffer that hands back whatever the csv writer writes.
+    """
+    def write(self, value):
+        return value
+
+
+def get_volunteers():
+    return Volunteer.objects.select_related(
+        'assignment__address__locality__state__country',
+    ).order_by(
+        'last_name',
+        'first_name',
+    )
+
+
+def get_recipients():
+    return Recipient.objects.select_related(
+        'address__locality__state__country',
+    ).annotate(
+        groups=StringAgg(
+            Concat(
+                'assignments__name',
+                Value(' - '),
+                Cast('assignments__number', CharField()),
+            ),
+            delimiter='; ',
+            ordering='assignments__name',
+        ),
+    ).order_by(
+        'size',
+        'head_count',
+    )
+
+
+# Each export is a queryset and (header, attribute path) column pairs.
+EXPORTS = {
+    'volunteers': (get_volunteers, [
+        ('Volunteer', 'name'),
+        ('Phone', 'phone'),
+        ('Number', 'number'),
+        ('Recipient', 'assignment.name'),
+        ('Address', 'assignment.address'),
+        ('Recipient Phone', 'assignment.phone'),
+        ('Email', 'assignment.email'),
+        ('Dog', 'assignment.is_dog'),
+        ('Size', 'assignment.get_size_display'),
+    ]),
+    'recipients': (get_recipients, [
+        ('Name', 'name'),
+        ('Address', 'address'),
+        ('Phone', 'phone'),
+        ('Email', 'email'),
+        ('Dog', 'is_dog'),
+        ('Size', 'get_size_display'),
+        ('Group(s)', 'groups'),
+        ('Total', 'head_count'),
+    ]),
+}
+
+
+def resolve(obj, path):
+    for attr in path.split('.'):
+        obj = getattr(obj, attr, None)
+        if obj is None:
+            return ''
+    return obj() if callable(obj) else obj
+
+
+def export_rows(kind, columns=None):
+    """
+    Yields the CSV lines of an export one row at a time.
+
+    Related rows are joined and rows are read in chunks off a server
+    side cursor, so memory stays flat however large the table.
+    """
+    get_queryset, default = EXPORTS[kind]
+    columns = columns or default
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in columns])
+    for obj in get_queryset().iterator(chunk_size=CHUNK_SIZE):
+        yield writer.writerow([resolve(obj, path) for _, path in columns])
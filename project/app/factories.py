@@ -1,16 +1,96 @@
 # First-Party
+from address.models import Address
+from address.models import Country
+from address.models import Locality
+from address.models import State
 from factory import Faker
+from factory import LazyAttribute
 from factory import PostGenerationMethodCall
+from factory import Sequence
+from factory import SubFactory
 from factory.django import DjangoModelFactory
+from factory.django import ImageField
+from factory.fuzzy import FuzzyChoice
+from factory.fuzzy import FuzzyFloat
 
 # Local
+from .models import Picture
+from .models import Recipient
 from .models import User
+from .models import Volunteer
 
 
 class UserFactory(DjangoModelFactory):
+    username = Sequence(lambda n: f'auth0|{n}')
     name = Faker('name_male')
     email = Faker('email')
     password = PostGenerationMethodCall('set_unusable_password')
     is_active = True
     class Meta:
         model = User
+
+
+class CountryFactory(DjangoModelFactory):
+    name = 'United States'
+    code = 'US'
+    class Meta:
+        model = Country
+        django_get_or_create = ('name',)
+
+
+class StateFactory(DjangoModelFactory):
+    name = 'Idaho'
+    code = 'ID'
+    country = SubFactory(CountryFactory)
+    class Meta:
+        model = State
+        django_get_or_create = ('name', 'country')
+
+
+class LocalityFactory(DjangoModelFactory):
+    name = 'Eagle'
+    postal_code = '83616'
+    state = SubFactory(StateFactory)
+    class Meta:
+        model = Locality
+        django_get_or_create = ('name', 'postal_code', 'state')
+
+
+class AddressFactory(DjangoModelFactory):
+    street_number = Faker('building_number')
+    route = Faker('street_name')
+    locality = SubFactory(LocalityFactory)
+    raw = LazyAttribute(lambda o: f'{o.street_number} {o.route}, Eagle, ID 83616')
+    formatted = LazyAttribute(lambda o: o.raw)
+    # Spread across Eagle, ID.
+    latitude = FuzzyFloat(43.65, 43.74)
+    longitude = FuzzyFloat(-116.42, -116.30)
+    class Meta:
+        model = Address
+
+
+class PictureFactory(DjangoModelFactory):
+    image = ImageField(width=1200, height=800, format='JPEG')
+    class Meta:
+        model = Picture
+
+
+class RecipientFactory(DjangoModelFactory):
+    name = Faker('name')
+    email = Faker('email')
+    phone = Faker('numerify', text='+1208%######')
+    size = FuzzyChoice(Recipient.SIZE, getter=lambda c: c[0])
+    is_dog = Faker('pybool')
+    notes = Faker('sentence')
+    class Meta:
+        model = Recipient
+
+
+class VolunteerFactory(DjangoModelFactory):
+    name = Faker('name')
+    email = Faker('email')
+    phone = Faker('numerify', text='+1208%######')
+    size = FuzzyChoice(Volunteer.SIZE, getter=lambda c: c[0])
+    number = Faker('random_int', min=1, max=20)
+    class Meta:
+        model = Volunteer
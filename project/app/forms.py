@@ -1,3 +1,6 @@
+# Standard Libary
+import zipfile
+
 # Django
 from django import forms
 from django.contrib.auth.forms import UserChangeForm as UserChangeFormBase
@@ -16,6 +19,51 @@ class DeleteForm(forms.Form):
     )
 
 
+class DashboardForm(forms.Form):
+    q = forms.CharField(
+        label='Search',
+        required=False,
+    )
+    status = forms.ChoiceField(
+        choices=[
+            ('', 'All Volunteers'),
+            ('assigned', 'Assigned'),
+            ('unassigned', 'Not Assigned'),
+        ],
+        required=False,
+    )
+    size = forms.TypedChoiceField(
+        choices=[('', 'All Sizes')] + list(Volunteer.SIZE),
+        coerce=int,
+        empty_value=None,
+        required=False,
+    )
+
+
+class ImportForm(forms.Form):
+    file = forms.FileField(
+        help_text='A CSV or XLSX file with a header row naming the fields.',
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data['file']
+        if not file.name.lower().endswith(('.csv', '.xlsx')):
+            raise ValidationError('Please upload a CSV or XLSX file.')
+        return file
+
+
+class PhotosForm(forms.Form):
+    file = forms.FileField(
+        help_text='A ZIP archive of photos.',
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data['file']
+        if not zipfile.is_zipfile(file):
+            raise ValidationError('Please upload a ZIP archive.')
+        file.seek(0)
+        return file
+
 
 class RecipientForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
@@ -75,6 +123,22 @@ class VolunteerForm(forms.ModelForm):
         }
 
 
+class VolunteerChangeListForm(forms.ModelForm):
+    """
+    Row form for the volunteer changelist.
+
+    Hands each row's joined assignment to its `AssignmentSelect` so
+    rendering the current choice needs no query.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        field = self.fields.get('assignment')
+        if field:
+            # Unwrap the admin's add/change links wrapper.
+            widget = getattr(field.widget, 'widget', field.widget)
+            widget.recipient = self.instance.assignment
+
+
 class UserCreationForm(UserCreationFormBase):
     """
     Custom user creation form for Auth0
@@ -0,0 +1,84 @@
+# Standard Libary
+import time
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Max
+
+# Local
+from .models import Picture
+
+# Cached page fragments live this long unless their version changes first.
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+def get_version_key(user_id):
+    return f'fragments:{user_id}'
+
+
+def get_version(user_id):
+    """
+    Returns the version a user's cached page fragments are keyed on.
+
+    The version is the time of the last change to anything shown on
+    the user's pages and never expires by itself; a change replaces
+    it, and fragments cached under the old one simply age out.
+    """
+    return cache.get_or_set(get_version_key(user_id), time.time_ns, None)
+
+
+def bump_versions(*user_ids):
+    """
+    Invalidates the users' page fragments once the transaction commits.
+
+    Waiting for the commit keeps a concurrent request from caching the
+    old rows under the new version.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+    transaction.on_commit(lambda: cache.set_many(
+        {get_version_key(user_id): time.time_ns() for user_id in user_ids},
+        None,
+    ))
+
+
+def is_cached(name, user_id, version):
+    return cache.has_key(make_template_fragment_key(name, [user_id, version]))
+
+
+# The anonymous index changes only when pictures do.
+INDEX_KEY = 'index:state'
+
+
+def get_index_state():
+    """
+    Returns the index page's last-modified time and ETag.
+
+    Both come from the newest `Picture.updated` and the picture count,
+    cached until a picture is saved or deleted.  The signup flag and
+    the release are added on every request, so flipping `ACTIVE` or
+    deploying new templates changes the ETag and the cached page's key
+    at once.
+    """
+    stats = cache.get(INDEX_KEY)
+    if stats is None:
+        stats = Picture.objects.aggregate(
+            updated=Max('updated'),
+            count=Count('id'),
+        )
+        cache.set(INDEX_KEY, stats, None)
+    updated = stats['updated']
+    stamp = updated.timestamp() if updated else 0
+    return {
+        'updated': updated,
+        'etag': f'{stats["count"]}-{stamp}-{int(settings.ACTIVE)}-{settings.RELEASE}',
+    }
+
+
+def clear_index_state():
+    transaction.on_commit(lambda: cache.delete(INDEX_KEY))
@@ -0,0 +1,107 @@
+# Standard Libary
+import math
+
+# Kilometers per degree of latitude.
+KM_PER_DEGREE = 111.2
+
+
+def distance(lat1, lng1, lat2, lng2):
+    """
+    Equirectangular distance in kilometers; fine over a single town.
+    """
+    scale = math.cos(math.radians((lat1 + lat2) / 2))
+    return KM_PER_DEGREE * math.hypot(lat2 - lat1, (lng2 - lng1) * scale)
+
+
+class KDTree(object):
+    """
+    Two-dimensional tree over (latitude, longitude, item) points.
+
+    Points can be removed once used; each node keeps a count of the
+    points still live beneath it so lookups skip emptied branches
+    instead of walking them.  Longitude is scaled by the latitude of
+    the data's midpoint so the two axes are comparable.
+    """
+    def __init__(self, points):
+        self.points = list(points)
+        self.scale = 1.0
+        if self.points:
+            lats = [p[0] for p in self.points]
+            self.scale = math.cos(math.radians((min(lats) + max(lats)) / 2))
+        n = len(self.points)
+        self.left = [None] * n
+        self.right = [None] * n
+        self.parent = [None] * n
+        self.axis = [0] * n
+        self.live = [0] * n
+        self.removed = [False] * n
+        self.coords = [(p[0], p[1] * self.scale) for p in self.points]
+        self.bounds = [None] * n
+        self.position = {}
+        self.root = self._build(list(range(n)), 0, None)
+
+    def __len__(self):
+        return self.live[self.root] if self.root is not None else 0
+
+    def _build(self, indexes, depth, parent):
+        if not indexes:
+            return None
+        axis = depth % 2
+        indexes.sort(key=lambda i: self.coords[i][axis])
+        mid = len(indexes) // 2
+        node = indexes[mid]
+        self.position[id(self.points[node])] = node
+        self.axis[node] = axis
+        self.parent[node] = parent
+        self.live[node] = len(indexes)
+        self.left[node] = self._build(indexes[:mid], depth + 1, node)
+        self.right[node] = self._build(indexes[mid + 1:], depth + 1, node)
+        ys = [self.coords[i][0] for i in indexes]
+        xs = [self.coords[i][1] for i in indexes]
+        self.bounds[node] = (min(ys), max(ys), min(xs), max(xs))
+        return node
+
+    def remove(self, point):
+        node = self.position[id(point)]
+        if self.removed[node]:
+            return
+        self.removed[node] = True
+        while node is not None:
+            self.live[node] -= 1
+            node = self.parent[node]
+
+    def nearest(self, lat, lng):
+        """
+        Returns the closest live point, or None when empty.
+        """
+        query = (lat, lng * self.scale)
+        best = [None, math.inf]
+
+        def gap(node):
+            # Squared distance from the query to the node's bounding box.
+            y0, y1, x0, x1 = self.bounds[node]
+            dy = max(y0 - query[0], 0, query[0] - y1)
+            dx = max(x0 - query[1], 0, query[1] - x1)
+            return dy * dy + dx * dx
+
+        def visit(node):
+            if node is None or not self.live[node] or gap(node) >= best[1]:
+                return
+            coords = self.coords[node]
+            if not self.removed[node]:
+                d = (coords[0] - query[0]) ** 2 + (coords[1] - query[1]) ** 2
+                if d < best[1]:
+                    best[0], best[1] = node, d
+            axis = self.axis[node]
+            diff = query[axis] - coords[axis]
+            if diff < 0:
+                near, far = self.left[node], self.right[node]
+            else:
+                near, far = self.right[node], self.left[node]
+            visit(near)
+            visit(far)
+
+        visit(self.root)
+        if best[0] is None:
+            return None
+        return self.points[best[0]]
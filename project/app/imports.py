@@ -0,0 +1,190 @@
+# Standard Libary
+import csv
+import io
+
+# Django
+from django.db import transaction
+from django.db.models import BooleanField
+from django.db.models import Q
+from django.db.models.functions import Upper
+
+# First-Party
+from address.models import Address
+from openpyxl import load_workbook
+from phonenumber_field.phonenumber import to_python
+
+# Local
+from .forms import RecipientForm
+from .forms import VolunteerForm
+
+# Rows saved per transaction.
+CHUNK_SIZE = 500
+
+# Row errors kept for the report; any more are only counted.
+MAX_ERRORS = 1000
+
+TRUE_VALUES = {'true', 't', 'yes', 'y', '1', 'x'}
+
+# Each import is validated by the form its people sign up with.
+IMPORTS = {
+    'recipients': RecipientForm,
+    'volunteers': VolunteerForm,
+}
+
+
+def cell(value):
+    if value is None:
+        return ''
+    # Spreadsheets store phone numbers and the like as floats.
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def read_rows(f, filename):
+    """
+    Yields (row number, dict) for each row of a CSV or XLSX file.
+
+    Rows are read one at a time so large files never sit parsed in
+    memory.  Headers match field names ignoring case, with spaces for
+    underscores; blank rows are skipped.
+    """
+    if filename.lower().endswith('.xlsx'):
+        workbook = load_workbook(f, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+    else:
+        rows = csv.reader(io.TextIOWrapper(f, encoding='utf-8-sig', newline=''))
+    header = [cell(h).lower().replace(' ', '_') for h in next(rows, [])]
+    for number, row in enumerate(rows, start=2):
+        values = [cell(v) for v in row]
+        if any(values):
+            yield number, dict(zip(header, values))
+
+
+def prepare(form_class, data):
+    """
+    Coerces spreadsheet values into what the form widgets expect.
+
+    Booleans may be written yes/no, and choices as their value, label
+    or identifier.
+    """
+    model = form_class._meta.model
+    for name in form_class._meta.fields:
+        field = model._meta.get_field(name)
+        value = data.get(name, '')
+        if isinstance(field, BooleanField):
+            data[name] = 'true' if value.lower() in TRUE_VALUES else 'false'
+        elif field.choices and value:
+            data[name] = choose(field.choices, value)
+    return data
+
+
+def choose(choices, value):
+    key = value.lower()
+    for db, label in choices:
+        if key in (str(db), str(label).lower()):
+            return db
+    # model_utils choices also answer to their identifiers.
+    return getattr(choices, key.replace(' ', '_'), value)
+
+
+def validate(form_class, data):
+    form = form_class(data=data)
+    # The address field saves an Address as it cleans; addresses are
+    # instead kept as raw text and created in bulk with their rows.
+    address = form.fields.pop('address', None)
+    errors = {name: [str(m) for m in e] for name, e in form.errors.items()}
+    if address and address.required and not data.get('address'):
+        errors['address'] = [str(address.error_messages['required'])]
+    return form, errors
+
+
+def get_keys(email, phone):
+    keys = set()
+    if email:
+        keys.add(('email', email.lower()))
+    phone = to_python(phone)
+    if phone and phone.is_valid():
+        keys.add(('phone', phone.as_e164))
+    return keys
+
+
+def save_chunk(model, chunk):
+    """
+    Creates the chunk's rows in one transaction, skipping any whose
+    email or phone is already on file.  Returns (created, duplicates).
+    """
+    existing = set()
+    # Emails match whatever their case, as they do within the file.
+    for email, phone in model.objects.annotate(
+        email_upper=Upper('email'),
+    ).filter(
+        Q(email_upper__in=[obj.email.upper() for obj, _ in chunk if obj.email]) |
+        Q(phone__in=[obj.phone for obj, _ in chunk]),
+    ).values_list('email', 'phone'):
+        existing |= get_keys(email, phone)
+    new = [
+        (obj, address) for obj, address in chunk
+        if not get_keys(obj.email, obj.phone) & existing
+    ]
+    with transaction.atomic():
+        located = [(obj, address) for obj, address in new if address]
+        addresses = Address.objects.bulk_create([
+            Address(raw=address) for _, address in located
+        ])
+        for (obj, _), address in zip(located, addresses):
+            obj.address = address
+        model.objects.bulk_create([obj for obj, _ in new])
+    return len(new), len(chunk) - len(new)
+
+
+def import_rows(kind, rows, progress=None):
+    """
+    Validates and saves (row number, dict) rows of an import.
+
+    Rows failing the sign-up form's rules are reported with their
+    errors, and rows sharing an email or phone with an earlier row or
+    an existing signup are skipped.  The rest are created in chunks;
+    `progress` is called with the report after each.
+    """
+    form_class = IMPORTS[kind]
+    model = form_class._meta.model
+    report = {
+        'rows': 0,
+        'created': 0,
+        'duplicates': 0,
+        'invalid': 0,
+        'errors': [],
+    }
+    has_address = 'address' in form_class._meta.fields
+    seen = set()
+    chunk = []
+
+    def flush():
+        created, duplicates = save_chunk(model, chunk)
+        report['created'] += created
+        report['duplicates'] += duplicates
+        chunk.clear()
+        if progress:
+            progress(report)
+
+    for number, data in rows:
+        report['rows'] += 1
+        form, errors = validate(form_class, prepare(form_class, data))
+        if errors:
+            report['invalid'] += 1
+            if len(report['errors']) < MAX_ERRORS:
+                report['errors'].append((number, errors))
+            continue
+        keys = get_keys(form.instance.email, form.instance.phone)
+        if keys & seen:
+            report['duplicates'] += 1
+            continue
+        seen |= keys
+        address = data.get('address', '') if has_address else ''
+        chunk.append((form.instance, address))
+        if len(chunk) == CHUNK_SIZE:
+            flush()
+    if chunk:
+        flush()
+    return report
@@ -0,0 +1,31 @@
+# Django
+from django.core.management.base import BaseCommand
+
+# First-Party
+from app.assign import assign_volunteers
+
+
+class Command(BaseCommand):
+    help = "Assign unassigned volunteers to recipients by capacity."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Clear all existing assignments before assigning.',
+        )
+        parser.add_argument(
+            '--mode',
+            choices=['capacity', 'nearest'],
+            default='capacity',
+            help='Match on capacity alone or on distance as well.',
+        )
+
+    def handle(self, *args, **options):
+        pairs = assign_volunteers(
+            reset=options['reset'],
+            mode=options['mode'],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Made {len(pairs)} assignments.")
+        )
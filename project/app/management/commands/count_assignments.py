@@ -0,0 +1,15 @@
+# Django
+from django.core.management.base import BaseCommand
+
+# First-Party
+from app.models import Recipient
+
+
+class Command(BaseCommand):
+    help = "Recompute every recipient's assigned group and head counts."
+
+    def handle(self, *args, **options):
+        count = Recipient.objects.update_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted {count} recipients.")
+        )
@@ -0,0 +1,137 @@
+# Standard Libary
+from datetime import timedelta
+
+# Django
+from django.contrib.admin import site
+from django.core import signing
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+# First-Party
+from app.exports import get_recipients
+from app.exports import get_volunteers
+from app.forms import DashboardForm
+from app.models import Recipient
+from app.models import User
+from app.models import Volunteer
+from app.views import DASHBOARD_PAGE_SIZE
+from app.views import get_dashboard_volunteers
+
+
+def get_changelist_page(model, params):
+    """
+    Returns the first page of `model`'s admin changelist as a staff
+    member requesting it with `params` sees it.
+    """
+    request = RequestFactory().get('/', params)
+    request.user = User(is_admin=True, is_active=True)
+    changelist = site._registry[model].get_changelist_instance(request)
+    return changelist.queryset[:changelist.list_per_page]
+
+
+def get_dashboard_page(params):
+    """
+    Returns the first page of the dashboard for `params`.
+    """
+    params = dict(params)
+    after = params.pop('after', None)
+    volunteers = get_dashboard_volunteers(DashboardForm(params), after)
+    return volunteers[:DASHBOARD_PAGE_SIZE + 1]
+
+
+def get_queries():
+    """
+    Returns the querysets behind the app's busy pages by label, built by
+    the admin, dashboard and export code that runs them.
+    """
+    # The admin's "Past 7 days" date filter.
+    today = timezone.localtime().replace(
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+    week = {
+        'created__gte': str(today - timedelta(days=7)),
+        'created__lt': str(today + timedelta(days=1)),
+    }
+    after = signing.dumps(
+        ['Smith', 'Jane', str(Volunteer._meta.pk.to_python(1))],
+        salt='dashboard',
+    )
+    return {
+        'recipients': get_changelist_page(Recipient, {}),
+        'recipients by size': get_changelist_page(Recipient, {
+            'size__exact': Recipient.SIZE.medium,
+        }),
+        'recipients with dogs': get_changelist_page(Recipient, {
+            'is_dog__exact': 1,
+        }),
+        'recipients created': get_changelist_page(Recipient, week),
+        'recipients search': get_changelist_page(Recipient, {'q': 'smith'}),
+        'recipients export': get_recipients(),
+        'volunteers': get_changelist_page(Volunteer, {}),
+        'volunteers created': get_changelist_page(Volunteer, week),
+        'volunteers search': get_changelist_page(Volunteer, {'q': 'smith'}),
+        'volunteers export': get_volunteers(),
+        'users search': get_changelist_page(User, {'q': 'smith'}),
+        'dashboard': get_dashboard_page({}),
+        'dashboard unassigned': get_dashboard_page({'status': 'unassigned'}),
+        'dashboard search': get_dashboard_page({'q': 'smith'}),
+        'dashboard next page': get_dashboard_page({'after': after}),
+    }
+
+
+def get_plan(cursor, queryset):
+    sql, params = queryset.query.sql_with_params()
+    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+    return cursor.fetchone()[0][0]['Plan']
+
+
+def get_seq_scans(plan):
+    scans = []
+    if plan['Node Type'] == 'Seq Scan':
+        scans.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        scans += get_seq_scans(child)
+    return scans
+
+
+class Command(BaseCommand):
+    help = "Explain the app's hot queries and report sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seqscan',
+            action='store_true',
+            help=(
+                "Leave sequential scans enabled, reporting only those the "
+                "planner picks for the data on hand."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        # With sequential scans priced out, any left have no index to use,
+        # so the check holds on a near-empty database too.
+        failed = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not options['seqscan']:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            for label, queryset in get_queries().items():
+                scans = get_seq_scans(get_plan(cursor, queryset))
+                if scans:
+                    failed.append(label)
+                    self.stdout.write(self.style.ERROR(
+                        f"{label}: sequential scan on {', '.join(scans)}"
+                    ))
+                else:
+                    self.stdout.write(f"{label}: indexed")
+                if options['verbosity'] > 1:
+                    self.stdout.write(queryset.explain())
+        if failed:
+            raise CommandError(f"{len(failed)} queries scan sequentially.")
+        self.stdout.write(self.style.SUCCESS("All queries use indexes."))
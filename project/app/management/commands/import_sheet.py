@@ -0,0 +1,42 @@
+# Django
+from django.core.management.base import BaseCommand
+
+# First-Party
+from app.imports import IMPORTS
+from app.imports import import_rows
+from app.imports import read_rows
+
+
+class Command(BaseCommand):
+    help = "Import recipients or volunteers from a CSV or XLSX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'kind',
+            choices=list(IMPORTS),
+        )
+        parser.add_argument(
+            'path',
+            help='CSV or XLSX file with a header row naming the fields.',
+        )
+
+    def handle(self, *args, **options):
+        def progress(report):
+            self.stdout.write(
+                f"{report['rows']} rows read, {report['created']} created"
+            )
+
+        with open(options['path'], 'rb') as f:
+            report = import_rows(
+                options['kind'],
+                read_rows(f, options['path']),
+                progress=progress,
+            )
+        for number, errors in report['errors']:
+            for field, messages in errors.items():
+                self.stderr.write(f"Row {number}: {field}: {' '.join(messages)}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report['created']} of {report['rows']} rows; "
+            f"{report['duplicates']} duplicates and "
+            f"{report['invalid']} invalid rows skipped."
+        ))
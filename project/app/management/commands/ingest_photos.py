@@ -0,0 +1,31 @@
+# Django
+from django.core.management.base import BaseCommand
+
+# First-Party
+from app.tasks import ingest_photos
+from app.tasks import iter_photos
+
+
+class Command(BaseCommand):
+    help = "Add every new photo in a directory or ZIP archive as a Picture."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Directory or ZIP archive of photos.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Uploads to run at once.',
+        )
+
+    def handle(self, *args, **options):
+        created, duplicates = ingest_photos(
+            iter_photos(options['path']),
+            workers=options['workers'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Added {created} pictures; skipped {duplicates} duplicates."
+        ))
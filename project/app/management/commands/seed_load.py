@@ -0,0 +1,173 @@
+# Standard Libary
+import io
+import random
+import time
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# First-Party
+from address.models import Address
+from address.models import Country
+from address.models import Locality
+from address.models import State
+from app.models import Picture
+from app.models import Recipient
+from app.fragments import clear_index_state
+from app.models import Volunteer
+from app.tasks import save_original
+from PIL import Image
+
+# Built from plain lists rather than the test factories, which need
+# the dev-only factory_boy and Faker.
+FIRST_NAMES = [
+    'Ann', 'Ben', 'Cal', 'Dee', 'Eli', 'Fay', 'Gus', 'Hal', 'Ida', 'Jan',
+    'Kim', 'Lou', 'May', 'Ned', 'Ona', 'Pat', 'Ray', 'Sue', 'Ted', 'Val',
+]
+LAST_NAMES = [
+    'Adams', 'Baker', 'Clark', 'Davis', 'Evans', 'Flores', 'Green',
+    'Hall', 'Irwin', 'Jones', 'King', 'Lee', 'Moore', 'Nelson', 'Owens',
+    'Parker', 'Reed', 'Smith', 'Turner', 'Young',
+]
+STREETS = [
+    'State St', 'Eagle Rd', 'Floating Feather Rd', 'Beacon Light Rd',
+    'Chinden Blvd', 'Linder Rd', 'Ballantyne Ln', 'Hill Rd',
+    'Plaza Dr', 'Park Ln',
+]
+
+
+def fake_person():
+    first = random.choice(FIRST_NAMES)
+    last = random.choice(LAST_NAMES)
+    return {
+        'name': f'{first} {last}',
+        'email': f'{first}.{last}{random.randint(1, 99999)}@example.com'.lower(),
+        'phone': f'+1208{random.randint(2000000, 9999999)}',
+    }
+
+
+def fake_address(locality):
+    street_number = str(random.randint(100, 9999))
+    route = random.choice(STREETS)
+    raw = f'{street_number} {route}, Eagle, ID 83616'
+    return Address(
+        street_number=street_number,
+        route=route,
+        locality=locality,
+        raw=raw,
+        formatted=raw,
+        # Spread across Eagle, ID.
+        latitude=random.uniform(43.65, 43.74),
+        longitude=random.uniform(-116.42, -116.30),
+    )
+
+
+def get_locality():
+    country, _ = Country.objects.get_or_create(
+        name='United States',
+        defaults={'code': 'US'},
+    )
+    state, _ = State.objects.get_or_create(
+        name='Idaho',
+        country=country,
+        defaults={'code': 'ID'},
+    )
+    locality, _ = Locality.objects.get_or_create(
+        name='Eagle',
+        postal_code='83616',
+        state=state,
+    )
+    return locality
+
+
+def save_seed_image():
+    """
+    Stores one generated photo for every seeded picture to share.
+    """
+    output = io.BytesIO()
+    Image.new('RGB', (1200, 800), (96, 128, 64)).save(output, 'JPEG')
+    return save_original('seed.jpg', output.getvalue())
+
+
+class Command(BaseCommand):
+    help = "Seed event-day volumes of fake data for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recipients',
+            type=int,
+            default=50000,
+            help='Number of recipients, each with a geocoded address.',
+        )
+        parser.add_argument(
+            '--volunteers',
+            type=int,
+            default=10000,
+            help='Number of volunteer groups, each assigned a recipient.',
+        )
+        parser.add_argument(
+            '--pictures',
+            type=int,
+            default=500,
+            help='Number of pictures.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Rows per INSERT.',
+        )
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            # One shared locality rather than a lookup per address.
+            locality = get_locality()
+            addresses = Address.objects.bulk_create(
+                [fake_address(locality) for _ in range(options['recipients'])],
+                batch_size=batch_size,
+            )
+            recipients = [
+                Recipient(
+                    address=address,
+                    size=random.choice(list(Recipient.SIZE))[0],
+                    is_dog=random.random() < 0.5,
+                    **fake_person(),
+                ) for address in addresses
+            ]
+            Recipient.objects.bulk_create(recipients, batch_size=batch_size)
+            volunteers = [
+                Volunteer(
+                    size=random.choice(list(Volunteer.SIZE))[0],
+                    number=random.randint(1, 20),
+                    **fake_person(),
+                ) for _ in range(options['volunteers'])
+            ]
+            assigned = random.sample(
+                recipients,
+                min(len(volunteers), len(recipients)),
+            )
+            for volunteer, recipient in zip(volunteers, assigned):
+                volunteer.assignment = recipient
+            Volunteer.objects.bulk_create(volunteers, batch_size=batch_size)
+            # One real photo shared by every picture, so they render
+            # without an upload each.  Without variants, deleting one
+            # leaves the shared file alone.
+            image = save_seed_image() if options['pictures'] else None
+            Picture.objects.bulk_create(
+                [Picture(image=image) for _ in range(options['pictures'])],
+                batch_size=batch_size,
+            )
+            Recipient.objects.filter(
+                pk__in=[r.pk for r in assigned],
+            ).update_counts()
+        # Bulk creates skip the signal that refreshes the index.
+        clear_index_state()
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(recipients)} recipients, "
+            f"{len(volunteers)} volunteers and "
+            f"{options['pictures']} pictures "
+            f"in {time.monotonic() - start:.1f}s."
+        ))
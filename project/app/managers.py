@@ -1,9 +1,30 @@
 # # Django
 # Django
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import models
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
 
+# Sent with the `usernames` of each delete of one or more users, so
+# their Auth0 accounts can go in one job.
+users_deleted = Signal()
 
-class UserManager(BaseUserManager):
+
+class UserQuerySet(models.QuerySet):
+    def delete(self):
+        with transaction.atomic():
+            usernames = list(self.values_list('username', flat=True))
+            result = super().delete()
+            users_deleted.send(sender=self.model, usernames=usernames)
+        return result
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """
     Custom user model manager where email is the unique identifiers
     for authentication instead of usernames.
@@ -31,3 +52,56 @@ class UserManager(BaseUserManager):
         if extra_fields.get('is_admin') is not True:
             raise ValueError('Superuser must have is_admin=True.')
         return self.create_user(username, password, **extra_fields)
+
+
+class PersonQuerySet(models.QuerySet):
+    """
+    Bulk writes that keep the name fields in step with `name`.
+
+    `Person.save()` is skipped by bulk operations, so the parsed name
+    fields are filled in here instead; thousands of signups then go in
+    as a few INSERTs.
+    """
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        objs = list(objs)
+        for obj in objs:
+            obj.set_name_fields()
+        return super().bulk_create(
+            objs,
+            batch_size=batch_size,
+            ignore_conflicts=ignore_conflicts,
+        )
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        if 'name' in fields:
+            objs = list(objs)
+            for obj in objs:
+                obj.set_name_fields()
+            fields = list(fields) + [
+                f for f in self.model.NAME_FIELDS if f not in fields
+            ]
+        return super().bulk_update(objs, fields, batch_size=batch_size)
+
+
+class RecipientQuerySet(PersonQuerySet):
+    def update_counts(self):
+        """
+        Recomputes `group_count` and `head_count` from assigned volunteers.
+
+        Runs as a single UPDATE with correlated subqueries and returns
+        the number of rows touched.
+        """
+        Volunteer = self.model._meta.get_field('assignments').related_model
+        assigned = Volunteer.objects.filter(
+            assignment=OuterRef('pk'),
+        ).order_by().values('assignment')
+        return self.update(
+            group_count=Coalesce(
+                Subquery(assigned.annotate(c=Count('pk')).values('c')),
+                0,
+            ),
+            head_count=Coalesce(
+                Subquery(assigned.annotate(s=Sum('number')).values('s')),
+                0,
+            ),
+        )
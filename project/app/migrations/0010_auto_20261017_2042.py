@@ -0,0 +1,44 @@
+# Generated by Django 3.1.4 on 2026-10-18 02:42
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def count_assignments(apps, schema_editor):
+    Recipient = apps.get_model('app', 'Recipient')
+    Volunteer = apps.get_model('app', 'Volunteer')
+    assigned = Volunteer.objects.filter(
+        assignment=OuterRef('pk'),
+    ).order_by().values('assignment')
+    Recipient.objects.update(
+        group_count=Coalesce(
+            Subquery(assigned.annotate(c=Count('pk')).values('c')),
+            0,
+        ),
+        head_count=Coalesce(
+            Subquery(assigned.annotate(s=Sum('number')).values('s')),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_auto_20201214_1026'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipient',
+            name='group_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Assigned Volunteer Groups'),
+        ),
+        migrations.AddField(
+            model_name='recipient',
+            name='head_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Assigned Volunteers'),
+        ),
+        migrations.RunPython(count_assignments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.4 on 2026-10-18 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_auto_20261017_2042'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='picture',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.4 on 2026-10-18 03:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0011_picture_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='picture',
+            name='digest',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.1.4 on 2026-10-18 09:12
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Django matches `icontains` as UPPER(column::text) LIKE UPPER(term), so
+# the trigram indexes are built over that same expression.
+TRIGRAM_INDEXES = [
+    ('app_recipient', 'name'),
+    ('app_recipient', 'email'),
+    ('app_recipient', 'phone'),
+    ('app_volunteer', 'name'),
+    ('app_volunteer', 'email'),
+    ('app_volunteer', 'phone'),
+    ('app_user', 'username'),
+    ('app_user', 'name'),
+    ('app_user', 'email'),
+    ('address_address', 'raw'),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0003_auto_20200830_1851'),
+        ('app', '0012_picture_digest'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunSQL(
+            sql=[
+                f'CREATE INDEX "{table}_{column}_trgm" ON "{table}" '
+                f'USING gin ((UPPER("{column}"::text)) gin_trgm_ops);'
+                for table, column in TRIGRAM_INDEXES
+            ],
+            reverse_sql=[
+                f'DROP INDEX "{table}_{column}_trgm";'
+                for table, column in TRIGRAM_INDEXES
+            ],
+        ),
+    ]
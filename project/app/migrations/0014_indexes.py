@@ -0,0 +1,45 @@
+# Generated by Django 3.1.4 on 2026-10-18 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0013_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipient',
+            index=models.Index(fields=['last_name', 'first_name'], name='recipient_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipient',
+            index=models.Index(fields=['size', 'head_count'], name='recipient_size_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipient',
+            index=models.Index(fields=['created'], name='recipient_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipient',
+            index=models.Index(fields=['updated'], name='recipient_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteer',
+            index=models.Index(fields=['last_name', 'first_name', 'id'], name='volunteer_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteer',
+            index=models.Index(condition=models.Q(assignment__isnull=True), fields=['last_name', 'first_name', 'id'], name='volunteer_unassigned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteer',
+            index=models.Index(fields=['created'], name='volunteer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteer',
+            index=models.Index(fields=['updated'], name='volunteer_updated_idx'),
+        ),
+    ]
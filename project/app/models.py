@@ -2,19 +2,49 @@
 # Standard Libary
 import os
 import secrets
+from functools import lru_cache
 
 # First-Party
 from address.models import AddressField
 from django.contrib.auth.models import AbstractBaseUser
 from django.db import models
+from django.db import transaction
 from django.utils.deconstruct import deconstructible
 from hashid_field import HashidAutoField
 from model_utils import Choices
+from model_utils import FieldTracker
 from nameparser import HumanName
 from phonenumber_field.modelfields import PhoneNumberField
 
 # Local
+from .managers import PersonQuerySet
+from .managers import RecipientQuerySet
 from .managers import UserManager
+from .managers import users_deleted
+
+
+@lru_cache(maxsize=10000)
+def parse_name(name):
+    """
+    Returns the `Person` fields derived from a full name.
+
+    Parsing is slow and the same names turn up again and again, so
+    results are memoized.  Pairs are returned rather than a dict so the
+    cached value can't be changed by a caller.
+    """
+    d = HumanName(full_name=name).as_dict()
+    greeting = d['nickname'] if d['nickname'] else d['first']
+    return (
+        ('formal_name', f'{d["title"]} {d["first"]} {d["last"]} {d["suffix"]}'.strip()),
+        ('greeting_name', greeting),
+        ('familiar_name', f'{greeting} {d["last"]}'.strip()),
+        ('prefix', d['title']),
+        ('first_name', d['first']),
+        ('middle_name', d['middle']),
+        ('last_name', d['last']),
+        ('nick_name', d['nickname']),
+        ('suffix', d['suffix']),
+    )
 
 
 class Person(models.Model):
@@ -82,35 +112,26 @@ class Person(models.Model):
         null=True,
     )
 
+    # Fields filled in from `name`.
+    NAME_FIELDS = [
+        'formal_name',
+        'greeting_name',
+        'familiar_name',
+        'prefix',
+        'first_name',
+        'middle_name',
+        'last_name',
+        'nick_name',
+        'suffix',
+    ]
+
     def save(self, *args, **kwargs):
-        instance = self._parse(name=self.name)
-        d = instance.as_dict()
-        setattr(self, 'formal_name', f'{d["title"]} {d["first"]} {d["last"]} {d["suffix"]}'.strip())
-        greeting = d['nickname'] if d['nickname'] else d['first']
-        setattr(self, 'greeting_name', greeting)
-        setattr(self, 'familiar_name', f'{greeting} {d["last"]}'.strip())
-        # Remap
-        remapping = {
-            'title': 'prefix',
-            'first': 'first_name',
-            'middle': 'middle_name',
-            'last': 'last_name',
-            'nickname': 'nick_name',
-            'suffix': 'suffix',
-        }
-        for attr, val in d.items():
-            setattr(self, remapping[attr], val)
+        self.set_name_fields()
         super().save(*args, **kwargs)
 
-    @classmethod
-    def _parse(cls, name):
-        """
-        Parses and returns a `HumanName` instance.
-        """
-        instance = HumanName(
-            full_name=name,
-        )
-        return instance
+    def set_name_fields(self):
+        for attr, val in parse_name(self.name):
+            setattr(self, attr, val)
 
     class Meta:
         abstract = True
@@ -160,6 +181,16 @@ class Recipient(Person):
         null=True,
         help_text='Actual Children',
     )
+    group_count = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text='Assigned Volunteer Groups',
+    )
+    head_count = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text='Assigned Volunteers',
+    )
     created = models.DateTimeField(
         auto_now_add=True,
     )
@@ -174,14 +205,31 @@ class Recipient(Person):
         unique=True,
     )
 
+    objects = RecipientQuerySet.as_manager()
+
     def is_assigned(self):
-        return bool(self.assignments.count())
+        return bool(self.group_count)
 
-    @property
-    def total(self):
-        return self.volunteers.aggregate(
-            s=models.Sum('number')
-        )['s']
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['last_name', 'first_name'],
+                name='recipient_name_idx',
+            ),
+            # Size filters, and the export's (size, head_count) ordering.
+            models.Index(
+                fields=['size', 'head_count'],
+                name='recipient_size_idx',
+            ),
+            models.Index(
+                fields=['created'],
+                name='recipient_created_idx',
+            ),
+            models.Index(
+                fields=['updated'],
+                name='recipient_updated_idx',
+            ),
+        ]
 
 
 class Volunteer(Person):
@@ -242,8 +290,36 @@ class Volunteer(Person):
         unique=True,
     )
 
+    objects = PersonQuerySet.as_manager()
+    tracker = FieldTracker(fields=[
+        'assignment',
+        'number',
+    ])
+
     def is_assigned(self):
-        return bool(self.assignments.count())
+        return self.assignment_id is not None
+
+    class Meta:
+        indexes = [
+            # The dashboard's keyset order.
+            models.Index(
+                fields=['last_name', 'first_name', 'id'],
+                name='volunteer_name_idx',
+            ),
+            models.Index(
+                fields=['last_name', 'first_name', 'id'],
+                name='volunteer_unassigned_idx',
+                condition=models.Q(assignment__isnull=True),
+            ),
+            models.Index(
+                fields=['created'],
+                name='volunteer_created_idx',
+            ),
+            models.Index(
+                fields=['updated'],
+                name='volunteer_updated_idx',
+            ),
+        ]
 
 
 @deconstructible
@@ -274,6 +350,51 @@ class Picture(models.Model):
         auto_now=True,
     )
 
+    # SHA-256 of the original, to skip photos uploaded twice.
+    digest = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    # Resized copies, as {width: {format: storage name}}.
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+    )
+
+    tracker = FieldTracker(fields=[
+        'image',
+    ])
+
+    # Widths of the variants made for browsers, in pixels.
+    WIDTHS = [400, 800, 1200]
+
+    def get_url(self, width=800):
+        """
+        Returns the largest JPEG variant no wider than `width`, or the
+        original until variants have been made.
+        """
+        widths = sorted(int(w) for w in self.variants)
+        fits = [w for w in widths if w <= width] or widths[:1]
+        if not fits:
+            return self.image.url
+        return self.image.storage.url(self.variants[str(fits[-1])]['jpeg'])
+
+    def get_srcset(self, format='jpeg'):
+        return ', '.join(
+            f'{self.image.storage.url(names[format])} {width}w'
+            for width, names in sorted(
+                self.variants.items(),
+                key=lambda item: int(item[0]),
+            )
+        )
+
+    def get_webp_srcset(self):
+        return self.get_srcset('webp')
+
 
 class User(AbstractBaseUser):
     id = HashidAutoField(
@@ -320,6 +441,12 @@ class User(AbstractBaseUser):
 
     objects = UserManager()
 
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            users_deleted.send(sender=User, usernames=[self.username])
+        return result
+
     @property
     def is_staff(self):
         return self.is_admin
@@ -0,0 +1,42 @@
+# Django
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Tables estimated above this many rows are not counted.
+ESTIMATE_THRESHOLD = 10000
+
+
+def estimate_rows(queryset):
+    """
+    Returns Postgres' estimate of the rows in the queryset's table.
+
+    The figure is kept up by autovacuum; a table never analyzed
+    estimates -1.
+    """
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return int(row[0]) if row else -1
+
+
+class EstimatedPaginator(Paginator):
+    """
+    Paginator that estimates the size of large, unfiltered tables.
+
+    Filtered querysets and small tables are counted exactly, so only
+    the unfiltered listing of a big table reads the planner's estimate
+    instead of scanning every row.
+    """
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where or query.distinct or query.is_sliced:
+            return super().count
+        estimate = estimate_rows(self.object_list)
+        if estimate < ESTIMATE_THRESHOLD:
+            return super().count
+        return estimate
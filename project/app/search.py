@@ -0,0 +1,46 @@
+# Django
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Q
+
+# Names are matched as written, without stemming or stop words.
+SEARCH_CONFIG = 'simple'
+
+
+def match(queryset, term, fields):
+    """
+    Filters to rows with every word of `term` in one of `fields`.
+
+    The case-insensitive substring tests are answered by the trigram
+    indexes, so partial names, emails and phone numbers all match
+    without reading the whole table.
+    """
+    for word in term.split():
+        q = Q()
+        for field in fields:
+            q |= Q(**{f'{field}__icontains': word})
+        queryset = queryset.filter(q)
+    return queryset
+
+
+def search(queryset, term, fields):
+    """
+    Matches `term` as `match` does and orders the rows best first.
+
+    Whole words of the name rank by full text and partial ones by
+    trigram similarity; the rank is annotated as `search_rank`, and
+    the queryset's own ordering breaks ties.
+    """
+    queryset = match(queryset, term, fields)
+    rank = SearchRank(
+        SearchVector('name', config=SEARCH_CONFIG),
+        SearchQuery(term, config=SEARCH_CONFIG),
+    ) + TrigramSimilarity('name', term)
+    return queryset.annotate(
+        search_rank=rank,
+    ).order_by(
+        '-search_rank',
+        *queryset.query.order_by,
+    )
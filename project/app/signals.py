@@ -1,10 +1,89 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
 from django.db.models.signals import pre_delete
 from django.dispatch import receiver
 
+from .backends import clear_user
+from .fragments import bump_versions
+from .fragments import clear_index_state
+from .managers import users_deleted
+from .models import Picture
+from .models import Recipient
 from .models import User
-from .tasks import delete_user
+from .models import Volunteer
+from .tasks import delete_users
+from .tasks import delete_variants
+from .tasks import process_picture
+
+
+@receiver(users_deleted, sender=User)
+def delete_auth0_users(sender, usernames, **kwargs):
+    # Queued only once the delete has committed.
+    if usernames:
+        transaction.on_commit(lambda: delete_users.delay(usernames))
 
 
 @receiver(pre_delete, sender=User)
 def pre_delete_user(sender, instance, **kwargs):
-    delete_user(instance.username)
+    clear_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def post_save_user(sender, instance, **kwargs):
+    clear_user(instance.pk)
+    bump_versions(instance.pk)
+
+
+@receiver(post_save, sender=Recipient)
+def post_save_recipient(sender, instance, **kwargs):
+    # Assigned volunteers see the recipient on their pages too.
+    bump_versions(
+        instance.user_id,
+        *instance.assignments.values_list('user', flat=True),
+    )
+
+
+@receiver(pre_delete, sender=Recipient)
+def pre_delete_recipient(sender, instance, **kwargs):
+    bump_versions(
+        instance.user_id,
+        *instance.assignments.values_list('user', flat=True),
+    )
+
+
+@receiver(post_save, sender=Volunteer)
+def post_save_volunteer(sender, instance, created, **kwargs):
+    bump_versions(instance.user_id)
+    if not created and not instance.tracker.changed():
+        return
+    ids = {
+        instance.assignment_id,
+        instance.tracker.previous('assignment'),
+    } - {None}
+    if ids:
+        Recipient.objects.filter(pk__in=ids).update_counts()
+
+
+@receiver(post_delete, sender=Volunteer)
+def post_delete_volunteer(sender, instance, **kwargs):
+    bump_versions(instance.user_id)
+    if instance.assignment_id:
+        Recipient.objects.filter(pk=instance.assignment_id).update_counts()
+
+
+@receiver(post_save, sender=Picture)
+def post_save_picture(sender, instance, created, **kwargs):
+    clear_index_state()
+    if instance.image and instance.tracker.has_changed('image'):
+        transaction.on_commit(
+            lambda: process_picture.delay(str(instance.pk))
+        )
+
+
+@receiver(post_delete, sender=Picture)
+def post_delete_picture(sender, instance, **kwargs):
+    clear_index_state()
+    storage = instance.image.storage
+    variants = instance.variants
+    transaction.on_commit(lambda: delete_variants(storage, variants))
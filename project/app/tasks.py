@@ -1,63 +1,110 @@
 # Standard Libary
-import csv
+import hashlib
+import io
+import os
+import tempfile
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
-import requests
-# First-Party
-from auth0.v3.authentication import GetToken
-from auth0.v3.management import Auth0
+import pydf
 # Django
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files import File
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.storage import get_storage_class
 from django.core.mail import EmailMultiAlternatives
-from django.db.models import Sum
-from django.http import FileResponse
+from django.core.mail import get_connection
+from django.template.loader import get_template
 from django.template.loader import render_to_string
+from django_rq import get_queue
 from django_rq import job
+from PIL import Image
+from PIL import ImageOps
+from PyPDF2 import PdfFileMerger
+from rq import Retry
+from rq import get_current_job
 
 # Local
+from .clients import auth0
+from .fragments import clear_index_state
+from .imports import import_rows
+from .imports import read_rows
 from .models import Picture
 from .models import Recipient
+from .models import User
+from .models import Volunteer
 
 
 # Auth0
-def get_auth0_token():
-    get_token = GetToken(settings.AUTH0_DOMAIN)
-    token = get_token.client_credentials(
-        settings.AUTH0_CLIENT_ID,
-        settings.AUTH0_CLIENT_SECRET,
-        f'https://{settings.AUTH0_DOMAIN}/api/v2/',
-    )
-    return token
+AUTH0_TOKEN_KEY = 'auth0:token'
 
-def get_auth0_client():
-    token = get_auth0_token()
-    client = Auth0(
-        settings.AUTH0_DOMAIN,
-        token['access_token'],
+def fetch_auth0_token():
+    response = auth0.post(
+        f'https://{settings.AUTH0_DOMAIN}/oauth/token',
+        json={
+            'grant_type': 'client_credentials',
+            'client_id': settings.AUTH0_CLIENT_ID,
+            'client_secret': settings.AUTH0_CLIENT_SECRET,
+            'audience': f'https://{settings.AUTH0_DOMAIN}/api/v2/',
+        },
     )
-    return client
+    response.raise_for_status()
+    return response.json()
 
-def get_user_data(user_id):
-    client = get_auth0_client()
-    data = client.users.get(user_id)
-    return data
+def get_auth0_token():
+    """
+    Returns a Management API token shared by every process via the cache.
 
-def put_auth0_payload(endpoint, payload):
+    Tokens are reused until a minute before they expire, and the lock
+    means only one process fetches a replacement when they do.
+    """
+    token = cache.get(AUTH0_TOKEN_KEY)
+    if token:
+        return token
+    with cache.lock(f'{AUTH0_TOKEN_KEY}:lock', timeout=30, blocking_timeout=30):
+        token = cache.get(AUTH0_TOKEN_KEY)
+        if token:
+            return token
+        token = fetch_auth0_token()
+        cache.set(
+            AUTH0_TOKEN_KEY,
+            token,
+            max(token.get('expires_in', 0) - 60, 0),
+        )
+    return token
+
+def get_auth0_headers():
     token = get_auth0_token()
     access_token = token['access_token']
     headers = {
         'Authorization': f'Bearer {access_token}',
     }
-    response = requests.put(
+    return headers
+
+def get_user_data(user_id):
+    response = auth0.get(
+        f'https://{settings.AUTH0_DOMAIN}/api/v2/users/{user_id}',
+        headers=get_auth0_headers(),
+    )
+    response.raise_for_status()
+    return response.json()
+
+def put_auth0_payload(endpoint, payload):
+    response = auth0.put(
         f'https://{settings.AUTH0_DOMAIN}/api/v2/{endpoint}',
-        headers=headers,
+        headers=get_auth0_headers(),
         json=payload,
     )
     return response
 
 @job
-def update_user(user):
+def update_user(user_id):
+    user = get_instance(User, user_id)
     data = get_user_data(user.username)
     user.data = data
     user.name = data.get('name', '')
@@ -70,6 +117,20 @@ def update_user(user):
 
 
 # Utility
+def get_instance(model, ref, *related):
+    """
+    Loads a fresh row for a job from its hashid.
+
+    Jobs enqueued before they took ids carry the pickled instance
+    instead; only its pk is used so those read current data too.
+    """
+    if isinstance(ref, model):
+        ref = ref.pk
+    return model.objects.select_related(*related).get(pk=ref)
+
+def get_upload_storage():
+    return get_storage_class(settings.UPLOAD_FILE_STORAGE)()
+
 def build_email(template, subject, from_email, context=None, to=[], cc=[], bcc=[], attachments=[], html_content=None):
     body = render_to_string(template, context)
     if html_content:
@@ -94,48 +155,208 @@ def send_email(email):
     return email.send()
 
 
-def export_csv():
-    rs = Recipient.objects.annotate(
-        total=Sum('assignments__volunteer__number')
-    ).order_by(
-        'size',
-        'total',
+BULK_EMAILS = {
+    'recipient': Recipient.objects.select_related(
+        'address__locality__state__country',
+    ),
+    'volunteer': Volunteer.objects.select_related(
+        'assignment__address__locality__state__country',
+    ),
+}
+
+# Seconds a bulk email job may take beyond pacing its messages.
+BULK_EMAIL_SLACK = 600
+
+def queue_bulk_email(kind, ids, template, subject, chunk_size=100, rate=10):
+    """
+    Queues `send_bulk_email`, timed out only once it has had twice as
+    long as pacing `ids` at `rate` takes.
+
+    A fixed timeout would kill large sends partway through.
+    """
+    return get_queue().enqueue(
+        send_bulk_email,
+        kind,
+        ids,
+        template,
+        subject,
+        chunk_size=chunk_size,
+        rate=rate,
+        job_timeout=2 * len(ids) // rate + BULK_EMAIL_SLACK,
     )
-    with open('export.csv', 'w') as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            'Name',
-            'Address',
-            'Phone',
-            'Email',
-            'Dog',
-            'Size',
-            'Group(s)',
-            'Total',
-        ])
-        for r in rs:
-            gs = r.assignments.values_list('volunteer__name', 'volunteer__number')
-            groups = "; ".join(["{0} - {1}".format(g[0], g[1]) for g in gs])
-            writer.writerow([
-                r.name,
-                r.address,
-                r.phone,
-                r.email,
-                r.is_dog,
-                r.get_size_display(),
-                groups,
-                r.total,
-            ])
-        content = ContentFile(f)
-        return FileResponse(
-            content,
-            as_attachment=True,
-            filename='export.csv',
+
+@job
+def send_bulk_email(kind, ids, template, subject, chunk_size=100, rate=10):
+    """
+    Emails every `kind` ('recipient' or 'volunteer') in `ids`.
+
+    The template is compiled once and messages go out over a single
+    connection in chunks of `chunk_size`, paced to at most `rate`
+    messages a second.  Returns the number sent.  Queue it with
+    `queue_bulk_email` so its timeout fits the send.
+    """
+    compiled = get_template(template)
+    queryset = BULK_EMAILS[kind].filter(
+        pk__in=ids,
+        email__isnull=False,
+    ).exclude(
+        email='',
+    )
+    sent = 0
+    with get_connection() as connection:
+        chunk = []
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(EmailMultiAlternatives(
+                subject=subject,
+                body=compiled.render({kind: obj}),
+                from_email='Rake Up Eagle <support@rakeupeagle.com>',
+                to=[obj.email],
+                connection=connection,
+            ))
+            if len(chunk) == chunk_size:
+                sent += send_chunk(connection, chunk, rate)
+                chunk = []
+        if chunk:
+            sent += send_chunk(connection, chunk, rate)
+    return sent
+
+def send_chunk(connection, messages, rate):
+    start = time.monotonic()
+    sent = connection.send_messages(messages) or 0
+    time.sleep(max(len(messages) / rate - (time.monotonic() - start), 0))
+    return sent
+
+
+# Handouts
+def render_handout(volunteer):
+    return render_to_string(
+        'app/pages/handout.html',
+        context={
+            'volunteer': volunteer,
+            'recipient': volunteer.assignment,
+        },
+    )
+
+def generate_handout_pdf(rendered):
+    return pydf.generate_pdf(
+        rendered,
+        enable_smart_shrinking=False,
+        orientation='Portrait',
+        margin_top='10mm',
+        margin_bottom='10mm',
+    )
+
+# Converted handouts, named by a hash of their HTML.
+HANDOUT_PAGES = 'handouts/pages'
+
+def get_handout_name(rendered):
+    digest = hashlib.sha256(rendered.encode()).hexdigest()
+    return f'{HANDOUT_PAGES}/{digest}.pdf'
+
+def get_handout_pdf(rendered):
+    """
+    Returns the PDF for a rendered handout, converting only on a miss.
+
+    PDFs are kept in file storage under a hash of the HTML, so any
+    change to the volunteer or their assignment renders differently
+    and misses; `build_handouts` prunes the ones no longer current.
+    """
+    name = get_handout_name(rendered)
+    if default_storage.exists(name):
+        with default_storage.open(name) as f:
+            return f.read()
+    pdf = generate_handout_pdf(rendered)
+    default_storage.save(name, ContentFile(pdf))
+    return pdf
+
+def prune_handouts(current):
+    """
+    Deletes stored handout PDFs not named in `current`.
+    """
+    try:
+        _, files = default_storage.listdir(HANDOUT_PAGES)
+    except FileNotFoundError:
+        # Nothing has been converted yet.
+        return
+    for name in files:
+        path = f'{HANDOUT_PAGES}/{name}'
+        if path not in current:
+            default_storage.delete(path)
+
+# Merged handouts, named by the job that built them.
+HANDOUTS = 'handouts'
+
+@job('default', timeout=3600, result_ttl=86400)
+def build_handouts():
+    """
+    Renders every volunteer's handout into one PDF in file storage and
+    returns its storage name.
+
+    Each handout is converted separately so the wkhtmltopdf processes
+    run side by side, one per core, and the pages are merged after.
+    Handouts that have not changed since the last run come from
+    storage.  The PDF is named for its job, so a download never gets
+    another build's, and earlier builds are deleted.
+
+    Builds run one at a time so neither prunes what the other is using.
+    """
+    with cache.lock(f'{HANDOUTS}:lock', timeout=3600):
+        volunteers = Volunteer.objects.select_related(
+            'assignment__address__locality__state__country',
+        ).order_by(
+            'last_name',
+            'first_name',
         )
+        rendered = [render_handout(volunteer) for volunteer in volunteers]
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            pdfs = list(executor.map(get_handout_pdf, rendered))
+        prune_handouts({get_handout_name(r) for r in rendered})
+        merger = PdfFileMerger()
+        for pdf in pdfs:
+            merger.append(io.BytesIO(pdf))
+        current = get_current_job()
+        job_id = current.id if current else uuid.uuid4().hex
+        with tempfile.TemporaryFile() as output:
+            merger.write(output)
+            merger.close()
+            name = default_storage.save(f'{HANDOUTS}/{job_id}.pdf', File(output))
+        _, files = default_storage.listdir(HANDOUTS)
+        for file in files:
+            if f'{HANDOUTS}/{file}' != name:
+                default_storage.delete(f'{HANDOUTS}/{file}')
+        return name
+
 
+# Imports
+@job('default', timeout=3600, result_ttl=86400)
+def import_file(kind, name):
+    """
+    Imports an uploaded CSV or XLSX of `kind` from storage, deletes the
+    upload and returns the report.
+
+    The running counts and row errors are saved to the job's meta
+    after every chunk so the import page can show progress.
+    """
+    current = get_current_job()
+
+    def progress(report):
+        if current:
+            current.meta['progress'] = report
+            current.save_meta()
+
+    storage = get_upload_storage()
+    with storage.open(name) as f:
+        report = import_rows(kind, read_rows(f, name), progress=progress)
+    storage.delete(name)
+    return report
 
 @job
-def send_recipient_confirmation(recipient):
+def send_recipient_confirmation(recipient_id):
+    recipient = get_instance(
+        Recipient,
+        recipient_id,
+        'address__locality__state__country',
+    )
     email = build_email(
         template='app/emails/recipient_confirmation.txt',
         subject='Rake Up Eagle Recipient Confirmation',
@@ -147,7 +368,8 @@ def send_recipient_confirmation(recipient):
 
 
 @job
-def send_volunteer_confirmation(volunteer):
+def send_volunteer_confirmation(volunteer_id):
+    volunteer = get_instance(Volunteer, volunteer_id)
     email = build_email(
         template='app/emails/volunteer_confirmation.txt',
         subject='Rake Up Eagle Volunteer Confirmation',
@@ -165,8 +387,169 @@ def create_and_upload_picture(path):
         picture.image.save('null', imagefile)
 
 
-@job
-def delete_user(user_id):
-    client = get_auth0_client()
-    response = client.users.delete(user_id)
-    return response
+# Pictures
+VARIANT_FORMATS = [
+    ('jpeg', 'jpg', {'quality': 80, 'optimize': True, 'progressive': True}),
+    ('webp', 'webp', {'quality': 80, 'method': 4}),
+]
+
+def make_variants(picture):
+    """
+    Saves JPEG and WebP copies of a picture at each of `Picture.WIDTHS`
+    and returns their storage names as {width: {format: name}}.
+
+    Copies are never wider than the original, which is rotated to
+    match its EXIF orientation since browsers disagree on honoring it.
+    """
+    storage = picture.image.storage
+    with picture.image.open('rb') as f:
+        image = ImageOps.exif_transpose(Image.open(f)).convert('RGB')
+    variants = {}
+    for width in sorted({min(w, image.width) for w in Picture.WIDTHS}):
+        copy = image.copy()
+        copy.thumbnail((width, image.height), Image.LANCZOS)
+        names = {}
+        for format, extension, options in VARIANT_FORMATS:
+            output = io.BytesIO()
+            copy.save(output, format, **options)
+            names[format] = storage.save(
+                f'{picture.image.name}_{width}.{extension}',
+                ContentFile(output.getvalue()),
+            )
+        variants[str(width)] = names
+    return variants
+
+def delete_variants(storage, variants, keep=None):
+    kept = {
+        name for names in (keep or {}).values() for name in names.values()
+    }
+    for names in variants.values():
+        for name in names.values():
+            if name not in kept:
+                storage.delete(name)
+
+PHOTO_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+# Photos held in memory at once while ingesting.
+INGEST_CHUNK_SIZE = 50
+
+def iter_photos(source):
+    """
+    Yields (filename, content) for each photo in a directory or in a
+    ZIP archive, given as a path or an open file.
+    """
+    if not isinstance(source, str) or zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or name.startswith('.') or '__MACOSX' in info.filename:
+                    continue
+                if name.lower().endswith(PHOTO_EXTENSIONS):
+                    yield name, archive.read(info)
+        return
+    for root, dirs, files in os.walk(source):
+        for name in sorted(files):
+            if name.startswith('.') or not name.lower().endswith(PHOTO_EXTENSIONS):
+                continue
+            with open(os.path.join(root, name), 'rb') as f:
+                yield name, f.read()
+
+def save_original(name, content):
+    field = Picture._meta.get_field('image')
+    return field.storage.save(
+        field.generate_filename(None, name),
+        ContentFile(content),
+    )
+
+def ingest_photos(photos, workers=4):
+    """
+    Creates a Picture for each new photo in (filename, content) pairs.
+
+    Photos are identified by a hash of their content, so any already
+    on file or repeated in the batch are skipped.  Photos are taken a
+    chunk at a time: originals are uploaded `workers` at a time, the
+    rows are created in one query and each picture's variants are
+    queued.  Returns (created, duplicates).
+    """
+    photos = iter(photos)
+    seen = set()
+    created = duplicates = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            chunk = list(islice(photos, INGEST_CHUNK_SIZE))
+            if not chunk:
+                break
+            new = {}
+            for name, content in chunk:
+                digest = hashlib.sha256(content).hexdigest()
+                if digest in seen:
+                    duplicates += 1
+                    continue
+                seen.add(digest)
+                new[digest] = (name, content)
+            for digest in Picture.objects.filter(
+                digest__in=list(new),
+            ).values_list('digest', flat=True):
+                duplicates += 1
+                del new[digest]
+            names = executor.map(lambda photo: save_original(*photo), new.values())
+            pictures = Picture.objects.bulk_create([
+                Picture(image=name, digest=digest)
+                for digest, name in zip(new, names)
+            ])
+            for picture in pictures:
+                process_picture.delay(str(picture.pk))
+            created += len(pictures)
+    # Bulk creates skip the signal that refreshes the index.
+    clear_index_state()
+    return created, duplicates
+
+@job('default', timeout=3600)
+def ingest_upload(name):
+    """
+    Ingests an uploaded ZIP of photos, then deletes the upload.
+    """
+    storage = get_upload_storage()
+    with storage.open(name) as f:
+        result = ingest_photos(iter_photos(f))
+    storage.delete(name)
+    return result
+
+@job('default', timeout=600)
+def process_picture(picture_id):
+    """
+    Replaces a picture's resized variants; queued whenever its image
+    changes.
+    """
+    picture = get_instance(Picture, picture_id)
+    if not picture.image:
+        return {}
+    previous = picture.variants
+    picture.variants = make_variants(picture)
+    picture.save(update_fields=['variants', 'updated'])
+    delete_variants(picture.image.storage, previous, keep=picture.variants)
+    return picture.variants
+
+
+@job(
+    'default',
+    retry=Retry(max=5, interval=[30, 120, 480, 1920, 7680]),
+    failure_ttl=60 * 60 * 24 * 30,
+)
+def delete_users(user_ids):
+    """
+    Deletes Auth0 accounts, retrying with backoff if Auth0 is down.
+
+    Accounts already gone are skipped so a retried batch is harmless.
+    Batches that still fail are kept in the failed job registry for a
+    month to be requeued by hand.
+    """
+    headers = get_auth0_headers()
+    for user_id in user_ids:
+        response = auth0.delete(
+            f'https://{settings.AUTH0_DOMAIN}/api/v2/users/{user_id}',
+            headers=headers,
+        )
+        if response.status_code != 404:
+            response.raise_for_status()
+    return user_ids
@@ -1,7 +1,25 @@
+# Standard Libary
+import io
+import zipfile
+
 # Django
 # Third-Party
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.urls import reverse
+from PIL import Image
+from PyPDF2 import PdfFileWriter
+
+# First-Party
+from app import paginators
+from app import tasks
+from app import views
+from app.factories import RecipientFactory
+from app.factories import VolunteerFactory
+from app.models import Picture
+from app.models import Recipient
+from app.models import Volunteer
 
 
 def test_deploy():
@@ -31,3 +49,171 @@ def test_dashboard(admin_client):
     path = reverse('dashboard')
     response = admin_client.get(path)
     assert response.status_code == 200
+
+@pytest.mark.django_db
+def test_handouts(admin_client, monkeypatch):
+    def generate(rendered):
+        writer = PdfFileWriter()
+        writer.addBlankPage(72, 72)
+        output = io.BytesIO()
+        writer.write(output)
+        return output.getvalue()
+    monkeypatch.setattr(tasks, 'generate_handout_pdf', generate)
+    path = reverse('handouts')
+    response = admin_client.get(path)
+    assert response.status_code == 200
+    VolunteerFactory(assignment=RecipientFactory())
+    response = admin_client.post(path, follow=True)
+    job = response.context['job']
+    assert job.result == f'handouts/{job.id}.pdf'
+    response = admin_client.get(reverse('handouts-pdf', args=[job.id]))
+    assert b''.join(response.streaming_content).startswith(b'%PDF')
+    response = admin_client.post(path, follow=True)
+    assert response.context['job'].result != job.result
+    response = admin_client.get(reverse('handouts-pdf', args=[job.id]))
+    assert response.status_code == 404
+
+@pytest.mark.django_db
+def test_export_volunteers(admin_client):
+    recipient = Recipient.objects.create(
+        name='Jane Doe',
+        size=Recipient.SIZE.small,
+        is_dog=False,
+    )
+    Volunteer.objects.create(
+        name='John Smith',
+        size=Volunteer.SIZE.small,
+        number=4,
+        assignment=recipient,
+    )
+    path = reverse('export-csv', args=['volunteers'])
+    response = admin_client.get(path)
+    assert response.status_code == 200
+    content = b''.join(response.streaming_content).decode()
+    assert 'John Smith,,4,Jane Doe' in content
+
+@pytest.mark.django_db
+def test_export_recipients(admin_client):
+    recipient = Recipient.objects.create(
+        name='Jane Doe',
+        size=Recipient.SIZE.small,
+        is_dog=False,
+    )
+    Volunteer.objects.create(
+        name='John Smith',
+        size=Volunteer.SIZE.small,
+        number=4,
+        assignment=recipient,
+    )
+    path = reverse('export-csv', args=['recipients'])
+    response = admin_client.get(path)
+    assert response.status_code == 200
+    content = b''.join(response.streaming_content).decode()
+    assert 'John Smith - 4,4' in content
+
+@pytest.mark.django_db
+def test_import_sheet(admin_client, raw_uploads):
+    path = reverse('import-sheet', args=['volunteers'])
+    upload = SimpleUploadedFile(
+        'volunteers.csv',
+        b"name,email,phone,size\nJohn Smith,john@example.com,208-555-0105,xs\n",
+    )
+    response = admin_client.post(path, {'file': upload}, follow=True)
+    assert response.status_code == 200
+    assert response.context['report']['created'] == 1
+    assert Volunteer.objects.filter(email='john@example.com').exists()
+    assert list(raw_uploads.values()) == [None]
+
+@pytest.mark.django_db
+def test_photos(admin_client, raw_uploads):
+    path = reverse('photos')
+    response = admin_client.get(path)
+    assert response.status_code == 200
+    upload = SimpleUploadedFile('photos.zip', b'not a zip')
+    response = admin_client.post(path, {'file': upload})
+    assert response.context['form'].errors
+    photo = io.BytesIO()
+    Image.new('RGB', (8, 8), 'red').save(photo, 'JPEG')
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as z:
+        z.writestr('empty/', '')
+        z.writestr('a.jpg', photo.getvalue())
+    upload = SimpleUploadedFile('photos.zip', archive.getvalue())
+    response = admin_client.post(path, {'file': upload}, follow=True)
+    assert response.context['job'].result == (1, 0)
+    # Only the archive goes to raw storage; the photo is an image.
+    image = Picture.objects.get().image
+    assert image.storage.exists(image.name)
+    assert list(raw_uploads.values()) == [None]
+
+@pytest.mark.django_db
+def test_dashboard_pages(admin_client, monkeypatch):
+    monkeypatch.setattr(views, 'DASHBOARD_PAGE_SIZE', 2)
+    recipient = RecipientFactory()
+    for i, name in enumerate(['Ann Bee', 'Cal Bee', 'Dee Bee', 'Ed Cox', 'Flo Dee']):
+        VolunteerFactory(name=name, assignment=recipient if i % 2 else None)
+    path = reverse('dashboard')
+    names = []
+    response = admin_client.get(path)
+    while True:
+        names += [v.name for v in response.context['volunteers']]
+        if not response.context['next_query']:
+            break
+        response = admin_client.get(f"{path}?{response.context['next_query']}")
+    assert names == ['Ann Bee', 'Cal Bee', 'Dee Bee', 'Ed Cox', 'Flo Dee']
+    response = admin_client.get(path, {'status': 'assigned'})
+    assert [v.name for v in response.context['volunteers']] == ['Cal Bee', 'Ed Cox']
+
+@pytest.mark.django_db
+def test_dashboard_volunteer(admin_client):
+    volunteer = VolunteerFactory(name='John Smith')
+    path = reverse('dashboard-volunteer', args=[volunteer.pk])
+    response = admin_client.get(path)
+    assert b'John Smith' in response.content
+
+@pytest.mark.django_db
+def test_volunteer_changelist_assignment(admin_client):
+    recipient = RecipientFactory(name='Jane Doe', size=Recipient.SIZE.medium)
+    VolunteerFactory(assignment=recipient, number=2)
+    response = admin_client.get(reverse('admin:app_volunteer_changelist'))
+    assert b'Jane Doe (3 more needed)' in response.content
+    assert b'admin-autocomplete' in response.content
+
+@pytest.mark.django_db
+def test_recipient_autocomplete(admin_client):
+    RecipientFactory(name='Jane Doe', size=Recipient.SIZE.small)
+    path = reverse('admin:app_recipient_autocomplete')
+    response = admin_client.get(path, {'term': 'jane'})
+    assert response.json()['results'][0]['text'] == 'Jane Doe (2 more needed)'
+
+@pytest.mark.django_db
+def test_recipient_search(admin_client):
+    RecipientFactory(name='Janet Jones', email='janet@example.com')
+    RecipientFactory(name='Jane Doe', email='doe@example.com')
+    RecipientFactory(name='Bob Ray', email='jane.ray@example.com')
+    RecipientFactory(name='Sam Poe', email='sam@example.com')
+    response = admin_client.get(reverse('admin:app_recipient_changelist'), {'q': 'jane'})
+    names = [r.name for r in response.context['cl'].result_list]
+    assert names == ['Jane Doe', 'Janet Jones', 'Bob Ray']
+
+@pytest.mark.django_db
+def test_dashboard_search(admin_client):
+    VolunteerFactory(name='Ann Bee', email='ann@example.com')
+    VolunteerFactory(name='Cal Bee', email='cal@example.com')
+    response = admin_client.get(reverse('dashboard'), {'q': 'cal bee'})
+    assert [v.name for v in response.context['volunteers']] == ['Cal Bee']
+
+@pytest.mark.django_db
+def test_recipient_changelist_estimated(admin_client, monkeypatch):
+    monkeypatch.setattr(paginators, 'ESTIMATE_THRESHOLD', 2)
+    RecipientFactory.create_batch(3, is_dog=False)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE app_recipient')
+    RecipientFactory(is_dog=True)
+    path = reverse('admin:app_recipient_changelist')
+    response = admin_client.get(path)
+    # The table is estimated as of the last analyze...
+    assert response.context['cl'].result_count == 3
+    # ...while filtered lists are counted.
+    response = admin_client.get(path, {'is_dog__exact': '1'})
+    assert response.context['cl'].result_count == 1
@@ -1,8 +1,13 @@
 # Django
 # Third-Party
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+# First-Party
+from app.factories import PictureFactory
+
 
 def test_deploy():
     assert True
@@ -14,6 +19,36 @@ def test_index(anon_client):
     response = anon_client.get(path)
     assert response.status_code == 200
 
+@pytest.mark.django_db(transaction=True)
+def test_index_cached(anon_client):
+    PictureFactory()
+    path = reverse('index')
+    response = anon_client.get(path)
+    assert b'<picture>' in response.content
+    assert 'public' in response['Cache-Control']
+    etag = response['ETag']
+    with CaptureQueriesContext(connection) as context:
+        response = anon_client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert len(context) == 0
+    PictureFactory()
+    response = anon_client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.content.count(b'<picture>') == 2
+
+@pytest.mark.django_db
+def test_index_active(anon_client, settings):
+    path = reverse('index')
+    settings.ACTIVE = False
+    closed = anon_client.get(path)
+    settings.ACTIVE = True
+    response = anon_client.get(path, HTTP_IF_NONE_MATCH=closed['ETag'])
+    assert response.status_code == 200
+    assert response.content != closed.content
+    settings.RELEASE = 'next'
+    response = anon_client.get(path, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == 200
+
 def test_about(anon_client):
     path = reverse('about')
     response = anon_client.get(path)
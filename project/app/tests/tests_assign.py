@@ -0,0 +1,108 @@
+# Django
+# Third-Party
+import pytest
+from django.core.management import call_command
+
+# First-Party
+from address.models import Address
+from app.assign import assign_volunteers
+from app.assign import match
+from app.assign import match_nearest
+from app.geo import KDTree
+from app.models import Recipient
+from app.models import Volunteer
+
+
+def test_match():
+    small = Volunteer(size=Volunteer.SIZE.xs)
+    large = Volunteer(size=Volunteer.SIZE.large)
+    lawn = Recipient(size=Recipient.SIZE.small)
+    field = Recipient(size=Recipient.SIZE.large)
+    pairs = match([large, small], [lawn, field])
+    assert pairs == [(large, field), (small, lawn)]
+
+
+@pytest.mark.django_db
+def test_assign_volunteers():
+    recipient = Recipient.objects.create(
+        name='Recipient',
+        size=Recipient.SIZE.medium,
+        is_dog=False,
+    )
+    volunteer = Volunteer.objects.create(
+        name='Volunteer',
+        size=Volunteer.SIZE.medium,
+    )
+    pairs = assign_volunteers()
+    assert pairs == [(volunteer, recipient)]
+    volunteer.refresh_from_db()
+    assert volunteer.assignment == recipient
+    assert assign_volunteers() == []
+
+
+@pytest.mark.django_db
+def test_assign_command():
+    call_command('assign', reset=True)
+
+
+def test_kdtree():
+    points = [
+        (43.70, -116.35, 'a'),
+        (43.71, -116.36, 'b'),
+        (43.60, -116.20, 'c'),
+    ]
+    tree = KDTree(points)
+    assert tree.nearest(43.601, -116.201)[2] == 'c'
+    tree.remove(points[2])
+    assert tree.nearest(43.601, -116.201)[2] == 'a'
+    tree.remove(points[0])
+    tree.remove(points[1])
+    assert len(tree) == 0
+    assert tree.nearest(43.601, -116.201) is None
+
+
+def test_match_nearest():
+    near = Recipient(
+        size=Recipient.SIZE.small,
+        address=Address(latitude=43.70, longitude=-116.35),
+    )
+    far = Recipient(
+        size=Recipient.SIZE.small,
+        address=Address(latitude=43.60, longitude=-116.20),
+    )
+    volunteer = Volunteer(size=Volunteer.SIZE.small)
+    pairs = match_nearest([volunteer], [far, near], origin=(43.69, -116.35))
+    assert pairs == [(volunteer, near)]
+
+
+@pytest.mark.django_db
+def test_assign_nearest_command():
+    call_command('assign', mode='nearest')
+
+
+@pytest.mark.django_db
+def test_assignment_counts():
+    recipient = Recipient.objects.create(
+        name='Recipient',
+        size=Recipient.SIZE.medium,
+        is_dog=False,
+    )
+    volunteer = Volunteer.objects.create(
+        name='Volunteer',
+        size=Volunteer.SIZE.medium,
+        number=6,
+        assignment=recipient,
+    )
+    recipient.refresh_from_db()
+    assert (recipient.group_count, recipient.head_count) == (1, 6)
+    volunteer.assignment = None
+    volunteer.save()
+    recipient.refresh_from_db()
+    assert (recipient.group_count, recipient.head_count) == (0, 0)
+    assign_volunteers()
+    recipient.refresh_from_db()
+    assert (recipient.group_count, recipient.head_count) == (1, 6)
+    volunteer.delete()
+    call_command('count_assignments')
+    recipient.refresh_from_db()
+    assert (recipient.group_count, recipient.head_count) == (0, 0)
@@ -0,0 +1,69 @@
+# Standard Libary
+import time
+
+# Django
+# Third-Party
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# First-Party
+from app.factories import RecipientFactory
+from app.factories import UserFactory
+from app.factories import VolunteerFactory
+from app.models import Picture
+from app.models import Recipient
+from app.models import Volunteer
+
+
+def measure(bench_report, name, client, path, queries, seconds):
+    with CaptureQueriesContext(connection) as context:
+        start = time.perf_counter()
+        response = client.get(path)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        elapsed = time.perf_counter() - start
+    bench_report[name] = {
+        'queries': len(context),
+        'seconds': round(elapsed, 4),
+    }
+    assert response.status_code == 200
+    assert len(context) <= queries
+    assert elapsed <= seconds
+
+
+@pytest.mark.parametrize('name,path,queries,seconds', [
+    ('dashboard', reverse('dashboard'), 10, 2.0),
+    ('recipient_changelist', reverse('admin:app_recipient_changelist'), 10, 2.0),
+    ('volunteer_changelist', reverse('admin:app_volunteer_changelist'), 10, 2.0),
+    ('user_changelist', reverse('admin:app_user_changelist'), 10, 2.0),
+    ('export_volunteers', reverse('export-csv', args=['volunteers']), 5, 2.0),
+    ('export_recipients', reverse('export-csv', args=['recipients']), 5, 2.0),
+])
+def test_admin_budget(seeded, admin_client, bench_report, name, path, queries, seconds):
+    measure(bench_report, name, admin_client, path, queries, seconds)
+
+
+def test_account_budget(seeded, bench_report):
+    user = UserFactory()
+    recipient = RecipientFactory(user=user)
+    VolunteerFactory(user=user, assignment=recipient)
+    client = Client()
+    client.force_login(user)
+    measure(bench_report, 'account', client, reverse('account'), 5, 1.0)
+
+
+@pytest.mark.django_db
+def test_seed_load(anon_client):
+    call_command('seed_load', recipients=200, volunteers=50, pictures=5)
+    assert Recipient.objects.filter(address__latitude__isnull=False).count() == 200
+    assert Recipient.objects.filter(group_count=1).count() == 50
+    assert Volunteer.objects.filter(assignment__isnull=False).count() == 50
+    assert Picture.objects.count() == 5
+    image = Picture.objects.first().image
+    assert image.storage.exists(image.name)
+    response = anon_client.get(reverse('index'))
+    assert response.content.count(b'<picture>') == 5
@@ -0,0 +1,87 @@
+# Standard Libary
+import io
+
+# Django
+# Third-Party
+import pytest
+from django.core.management import call_command
+from address.models import Address
+from openpyxl import Workbook
+
+# First-Party
+from app.factories import RecipientFactory
+from app.imports import import_rows
+from app.imports import read_rows
+from app.imports import save_chunk
+from app.models import Recipient
+from app.models import Volunteer
+
+CSV = b"""Name,Email,Phone,Address,Size,Is Dog,Notes
+Jane Doe,jane@example.com,208-555-0101,"1 Main St, Eagle, ID",Small,yes,
+John Roe,JANE@example.com,208-555-0102,"2 Main St, Eagle, ID",medium,no,
+Ann Poe,ann@example.com,208-555-0103,,large,no,
+Bo Moe,bo@example.com,208-555-0104,"4 Main St, Eagle, ID",huge,no,
+"""
+
+
+@pytest.mark.django_db
+def test_import_recipients():
+    report = import_rows('recipients', read_rows(io.BytesIO(CSV), 'r.csv'))
+    assert report['created'] == 1
+    assert report['duplicates'] == 1
+    assert report['invalid'] == 2
+    assert [number for number, _ in report['errors']] == [4, 5]
+    recipient = Recipient.objects.get()
+    assert recipient.first_name == 'Jane'
+    assert recipient.is_dog is True
+    assert recipient.size == Recipient.SIZE.small
+    assert recipient.address.raw == '1 Main St, Eagle, ID'
+
+
+@pytest.mark.django_db
+def test_import_skips_existing():
+    import_rows('recipients', read_rows(io.BytesIO(CSV), 'r.csv'))
+    report = import_rows('recipients', read_rows(io.BytesIO(CSV), 'r.csv'))
+    assert report['created'] == 0
+    assert Recipient.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_import_skips_existing_email_case():
+    RecipientFactory(email='Jane@Example.com', phone='+12085550199')
+    report = import_rows('recipients', read_rows(io.BytesIO(CSV), 'r.csv'))
+    assert report['duplicates'] == 2
+    assert not Recipient.objects.filter(name='Jane Doe').exists()
+
+
+@pytest.mark.django_db
+def test_save_chunk_addresses():
+    chunk = [
+        (RecipientFactory.build(name='Jane Doe'), '1 Main St, Eagle, ID'),
+        (RecipientFactory.build(name='Ann Poe'), ''),
+    ]
+    assert save_chunk(Recipient, chunk) == (2, 0)
+    assert Address.objects.get().raw == '1 Main St, Eagle, ID'
+    assert Recipient.objects.get(name='Ann Poe').address is None
+
+
+@pytest.mark.django_db
+def test_import_volunteers_xlsx():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['Name', 'Email', 'Phone', 'Size'])
+    sheet.append(['John Smith', 'john@example.com', 2085550105, 'Small (3-5 Adults)'])
+    f = io.BytesIO()
+    workbook.save(f)
+    f.seek(0)
+    report = import_rows('volunteers', read_rows(f, 'v.xlsx'))
+    assert report['errors'] == []
+    assert Volunteer.objects.get().last_name == 'Smith'
+
+
+@pytest.mark.django_db
+def test_import_command(tmp_path):
+    path = tmp_path / 'recipients.csv'
+    path.write_bytes(CSV)
+    call_command('import_sheet', 'recipients', str(path))
+    assert Recipient.objects.count() == 1
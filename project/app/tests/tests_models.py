@@ -0,0 +1,45 @@
+# Django
+# Third-Party
+import pytest
+from django.core.management import call_command
+
+# First-Party
+from app.factories import RecipientFactory
+from app.factories import VolunteerFactory
+from app.models import Recipient
+from app.models import Volunteer
+from app.models import parse_name
+
+
+def test_parse_name():
+    fields = dict(parse_name('Dr. Robert "Bob" Smith Jr.'))
+    assert fields['first_name'] == 'Robert'
+    assert fields['last_name'] == 'Smith'
+    assert fields['greeting_name'] == 'Bob'
+    assert fields['familiar_name'] == 'Bob Smith'
+    assert fields['formal_name'] == 'Dr. Robert Smith Jr.'
+
+
+@pytest.mark.django_db
+def test_bulk_create_sets_names():
+    Recipient.objects.bulk_create([
+        RecipientFactory.build(name='Jane Doe'),
+    ])
+    recipient = Recipient.objects.get()
+    assert recipient.first_name == 'Jane'
+    assert recipient.last_name == 'Doe'
+
+
+@pytest.mark.django_db
+def test_bulk_update_sets_names():
+    volunteer = VolunteerFactory(name='Jane Doe')
+    volunteer.name = 'John Roe'
+    Volunteer.objects.bulk_update([volunteer], ['name'])
+    volunteer.refresh_from_db()
+    assert volunteer.first_name == 'John'
+    assert volunteer.familiar_name == 'John Roe'
+
+@pytest.mark.django_db
+def test_explain_uses_indexes(capsys):
+    call_command('explain')
+    assert 'sequential scan' not in capsys.readouterr().out
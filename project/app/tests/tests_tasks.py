@@ -0,0 +1,203 @@
+# Standard Libary
+import io
+import json
+import zipfile
+
+# Django
+# Third-Party
+import pytest
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from PIL import Image
+from requests import Response
+from requests.adapters import BaseAdapter
+
+# First-Party
+from app import tasks
+from app.clients import Session
+from app.factories import UserFactory
+from app.models import Picture
+from app.models import Recipient
+from app.models import User
+from app.models import Volunteer
+
+
+def test_get_handout_pdf(monkeypatch):
+    calls = []
+    def generate(rendered):
+        calls.append(rendered)
+        return b'%PDF'
+    monkeypatch.setattr(tasks, 'generate_handout_pdf', generate)
+    rendered = '<p>test_get_handout_pdf</p>'
+    assert tasks.get_handout_pdf(rendered) == b'%PDF'
+    assert tasks.get_handout_pdf(rendered) == b'%PDF'
+    assert calls == [rendered]
+    tasks.prune_handouts({tasks.get_handout_name(rendered)})
+    assert default_storage.exists(tasks.get_handout_name(rendered))
+    tasks.prune_handouts(set())
+    assert not default_storage.listdir(tasks.HANDOUT_PAGES)[1]
+
+
+@pytest.mark.django_db
+def test_build_handouts_empty():
+    # No volunteers means no pages have been stored to prune.
+    name = tasks.build_handouts()
+    assert default_storage.exists(name)
+
+
+class Auth0Stub(BaseAdapter):
+    """
+    Stands in for the Auth0 endpoints, answering every call with 200.
+    """
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def send(self, request, **kwargs):
+        self.calls.append((request.method, request.url))
+        response = Response()
+        response.status_code = 200
+        response._content = json.dumps({
+            'access_token': 'token',
+            'expires_in': 86400,
+        }).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def auth0_stub(monkeypatch):
+    stub = Auth0Stub()
+    session = Session()
+    session.mount('https://', stub)
+    monkeypatch.setattr(tasks, 'auth0', session)
+    return stub
+
+
+def test_get_auth0_token(auth0_stub):
+    assert tasks.get_auth0_token()['access_token'] == 'token'
+    assert tasks.get_auth0_token()['access_token'] == 'token'
+    assert auth0_stub.calls == [
+        ('POST', f'https://{settings.AUTH0_DOMAIN}/oauth/token'),
+    ]
+
+
+def test_delete_users(auth0_stub):
+    tasks.delete_users(['one', 'two'])
+    assert [c[0] for c in auth0_stub.calls] == ['POST', 'DELETE', 'DELETE']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_delete_users_batched(monkeypatch):
+    batches = []
+    monkeypatch.setattr(tasks.delete_users, 'delay', batches.append)
+    UserFactory(username='one')
+    UserFactory(username='two')
+    User.objects.all().delete()
+    assert len(batches) == 1
+    assert sorted(batches[0]) == ['one', 'two']
+    UserFactory(username='three').delete()
+    assert batches[1] == ['three']
+
+
+@pytest.mark.django_db
+def test_send_bulk_email(mailoutbox):
+    recipient = Recipient.objects.create(
+        name='Jane Doe',
+        size=Recipient.SIZE.small,
+        is_dog=False,
+    )
+    volunteers = [
+        Volunteer.objects.create(
+            name=f'Volunteer {i}',
+            email=f'volunteer{i}@localhost',
+            size=Volunteer.SIZE.small,
+            assignment=recipient,
+        ) for i in range(3)
+    ]
+    sent = tasks.send_bulk_email(
+        'volunteer',
+        [str(v.pk) for v in volunteers],
+        'app/emails/volunteer_assignment.txt',
+        'Assignment',
+        chunk_size=2,
+        rate=1000,
+    )
+    assert sent == 3
+    assert len(mailoutbox) == 3
+    assert 'Jane Doe' in mailoutbox[0].body
+    job = tasks.queue_bulk_email(
+        'volunteer',
+        [str(v.pk) for v in volunteers],
+        'app/emails/volunteer_assignment.txt',
+        'Assignment',
+        rate=2,
+    )
+    assert job.result == 3
+    assert job.timeout == 3 + tasks.BULK_EMAIL_SLACK
+
+
+@pytest.mark.django_db
+def test_send_volunteer_confirmation(mailoutbox):
+    volunteer = Volunteer.objects.create(
+        name='Volunteer',
+        email='volunteer@localhost',
+        size=Volunteer.SIZE.small,
+    )
+    tasks.send_volunteer_confirmation(str(volunteer.pk))
+    # Instances pickled by older releases are still accepted.
+    tasks.send_volunteer_confirmation(volunteer)
+    assert len(mailoutbox) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_process_picture():
+    output = io.BytesIO()
+    Image.new('RGB', (1000, 500), 'orange').save(output, 'JPEG')
+    picture = Picture.objects.create()
+    picture.image.save('photo', ContentFile(output.getvalue()))
+    picture.refresh_from_db()
+    assert sorted(picture.variants) == ['1000', '400', '800']
+    storage = picture.image.storage
+    with storage.open(picture.variants['400']['webp']) as f:
+        assert Image.open(f).size == (400, 200)
+    assert picture.get_url().endswith('_800.jpg')
+    picture.delete()
+    assert not storage.exists(picture.variants['400']['jpeg'])
+
+
+def make_photo(color):
+    output = io.BytesIO()
+    Image.new('RGB', (300, 200), color).save(output, 'JPEG')
+    return output.getvalue()
+
+
+@pytest.mark.django_db
+def test_ingest_zip():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as z:
+        z.writestr('a.jpg', make_photo('red'))
+        z.writestr('copy/a.jpg', make_photo('red'))
+        z.writestr('b.JPG', make_photo('blue'))
+        z.writestr('notes.txt', 'not a photo')
+    archive.seek(0)
+    assert tasks.ingest_photos(tasks.iter_photos(archive)) == (2, 1)
+    assert all(p.variants for p in Picture.objects.all())
+    archive.seek(0)
+    assert tasks.ingest_photos(tasks.iter_photos(archive)) == (0, 3)
+
+
+@pytest.mark.django_db
+def test_ingest_photos_command(tmp_path):
+    folder = tmp_path / 'photos'
+    folder.mkdir()
+    (folder / 'a.jpg').write_bytes(make_photo('red'))
+    (folder / 'b.png').write_bytes(make_photo('green'))
+    call_command('ingest_photos', str(folder))
+    assert Picture.objects.count() == 2
@@ -0,0 +1,110 @@
+# Django
+# Third-Party
+import pytest
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# First-Party
+from app import backends
+from app.assign import assign_volunteers
+from app.backends import Auth0Backend
+from app.factories import RecipientFactory
+from app.factories import UserFactory
+from app.factories import VolunteerFactory
+from app.models import Recipient
+from app.models import User
+from app.models import Volunteer
+
+
+@pytest.fixture
+def volunteer_client():
+    user = UserFactory()
+    VolunteerFactory(user=user, size=Volunteer.SIZE.small)
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+def test_account_cached(volunteer_client):
+    path = reverse('account')
+    volunteer_client.get(path)
+    with CaptureQueriesContext(connection) as context:
+        response = volunteer_client.get(path)
+    assert response.status_code == 200
+    assert not any('app_volunteer' in q['sql'] for q in context)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_volunteer_invalidated(volunteer_client):
+    path = reverse('volunteer')
+    response = volunteer_client.get(path)
+    assert b'Volunteer Assignment' not in response.content
+    RecipientFactory(name='Jane Doe', size=Recipient.SIZE.small)
+    assign_volunteers()
+    response = volunteer_client.get(path)
+    assert b'Jane Doe' in response.content
+    Recipient.objects.get().delete()
+    response = volunteer_client.get(path)
+    assert b'Jane Doe' not in response.content
+
+
+@pytest.mark.django_db
+def test_recipient_redirect(volunteer_client):
+    response = volunteer_client.get(reverse('recipient'))
+    assert response.url == reverse('recipient-create')
+
+
+@pytest.mark.django_db
+def test_user_cached(volunteer_client):
+    path = reverse('account')
+    volunteer_client.get(path)
+    with CaptureQueriesContext(connection) as context:
+        volunteer_client.get(path)
+    assert not any('FROM "app_user"' in q['sql'] for q in context)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_user_cache_cleared():
+    user = UserFactory(name='John Smith')
+    backend = Auth0Backend()
+    backend.get_user(user.pk)
+    cached = backend.get_user(user.pk)
+    assert (cached.pk, cached.name) == (user.pk, 'John Smith')
+    user.name = 'Jack Smith'
+    user.save()
+    assert backend.get_user(user.pk).name == 'Jack Smith'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_user_cache_race(monkeypatch):
+    user = UserFactory(name='John Smith')
+    get_user_values = backends.get_user_values
+
+    def save_first(stale):
+        # Another request saves between this one's read and its set.
+        fresh = User.objects.get(pk=stale.pk)
+        fresh.name = 'Jack Smith'
+        fresh.save()
+        return get_user_values(stale)
+
+    monkeypatch.setattr(backends, 'get_user_values', save_first)
+    backend = Auth0Backend()
+    assert backend.get_user(user.pk).name == 'John Smith'
+    monkeypatch.setattr(backends, 'get_user_values', get_user_values)
+    assert backend.get_user(user.pk).name == 'Jack Smith'
+
+
+@pytest.mark.django_db
+def test_authenticate_upsert():
+    backend = Auth0Backend()
+    payload = {'username': 'auth0|1', 'name': 'Jane Doe', 'email': 'jane@example.com'}
+    user = backend.authenticate(None, **payload)
+    assert not user.has_usable_password()
+    with CaptureQueriesContext(connection) as context:
+        assert backend.authenticate(None, **payload) == user
+    assert len(context) == 1
+    backend.authenticate(None, **{**payload, 'email': 'doe@example.com'})
+    assert User.objects.get().email == 'doe@example.com'
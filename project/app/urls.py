@@ -39,10 +39,10 @@ urlpatterns = [
     # Admin
     path('dashboard/', views.dashboard, name='dashboard',),
     path('dashboard/<volunteer_id>', views.dashboard_volunteer, name='dashboard-volunteer',),
-    # path('handout/', views.handouts, name='handouts',),
-    # path('handout/<volunteer_id>', views.handout, name='handout',),
-    # path('handout/<volunteer_id>', views.handout, name='handout',),
-    # path('handout/<volunteer_id>/pdf', views.handout_pdf, name='handout_pdf',),
-    # path('handouts/', views.handout_pdfs, name='handouts',),
-    # path('csv/', views.export_csv, name='export_csv',),
+    path('handout/<volunteer_id>/pdf', views.handout_pdf, name='handout-pdf',),
+    path('handouts/', views.handouts, name='handouts',),
+    path('handouts/<job_id>/pdf', views.handouts_pdf, name='handouts-pdf',),
+    path('export/<kind>', views.export_csv, name='export-csv',),
+    path('import/<kind>', views.import_sheet, name='import-sheet',),
+    path('photos/', views.photos, name='photos',),
 ]
@@ -1,6 +1,3 @@
-import csv
-
-import pydf
 import requests
 from django.conf import settings
 from django.contrib import messages
@@ -9,40 +6,109 @@ from django.contrib.auth import authenticate
 from django.contrib.auth import login as log_in
 from django.contrib.auth import logout as log_out
 from django.contrib.auth.decorators import login_required
+from django.contrib.messages import get_messages
+from django.core import signing
+from django.core.cache import cache
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
 from django.http import FileResponse
+from django.http import Http404
 from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
 from django.shortcuts import render
 from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.cache import patch_vary_headers
 from django.utils.crypto import get_random_string
-
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.http import condition
+from django_rq import get_queue
+
+from .clients import auth0
+from .exports import EXPORTS
+from .exports import export_rows
+from .forms import DashboardForm
 from .forms import DeleteForm
+from .forms import ImportForm
+from .forms import PhotosForm
 from .forms import RecipientForm
 from .forms import VolunteerForm
+from .fragments import FRAGMENT_TIMEOUT
+from .fragments import get_index_state
+from .fragments import get_version
+from .fragments import is_cached
+from .imports import IMPORTS
 from .models import Picture
 from .models import Recipient
 from .models import Volunteer
+from .search import match
+from .tasks import build_handouts
+from .tasks import get_handout_pdf
+from .tasks import get_upload_storage
+from .tasks import import_file
+from .tasks import ingest_upload
+from .tasks import render_handout
 from .tasks import send_recipient_confirmation
 from .tasks import send_volunteer_confirmation
 
 
+def get_recipient(user):
+    return Recipient.objects.select_related(
+        'address__locality__state__country',
+    ).filter(user=user).first()
+
+def get_volunteer(user):
+    return Volunteer.objects.select_related(
+        'assignment__address__locality__state__country',
+    ).filter(user=user).first()
+
+
 # Root
-def index(request):
-    if request.user.is_authenticated:
-        return redirect('account')
-    pictures = Picture.objects.all()
-    return render(
-        request,
+def is_cacheable(request):
+    # Signed-in users are redirected, and pending messages (say, after
+    # deleting an account) must not end up in the shared copy.
+    return not request.user.is_authenticated and not get_messages(request)
+
+def index_etag(request):
+    if is_cacheable(request):
+        return get_index_state()['etag']
+
+def index_last_modified(request):
+    if is_cacheable(request):
+        return get_index_state()['updated']
+
+def render_index(request):
+    return render_to_string(
         'app/pages/index.html',
         context={
-            'pictures': pictures,
+            'pictures': Picture.objects.order_by('created'),
             'is_active': settings.ACTIVE,
-        }
+        },
+        request=request,
     )
 
+@condition(etag_func=index_etag, last_modified_func=index_last_modified)
+def index(request):
+    if request.user.is_authenticated:
+        return redirect('account')
+    if not is_cacheable(request):
+        return HttpResponse(render_index(request))
+    key = f"index:{get_index_state()['etag']}"
+    content = cache.get(key)
+    if content is None:
+        content = render_index(request)
+        cache.set(key, content, FRAGMENT_TIMEOUT)
+    response = HttpResponse(content)
+    # Lets the CDN and browsers share the anonymous page for a while.
+    patch_cache_control(response, public=True, max_age=300)
+    patch_vary_headers(response, ['Cookie'])
+    return response
+
 # Authentication
 def login(request):
     # Set landing page depending on initial button
@@ -89,13 +155,16 @@ def callback(request):
         'code': code,
         'grant_type': 'authorization_code'
     }
-    token = requests.post(
+    token = auth0.post(
         token_url,
         json=token_payload,
     ).json()
     access_token = token['access_token']
-    user_url = f'https://{settings.AUTH0_DOMAIN}/userinfo?access_token={access_token}'
-    payload = requests.get(user_url).json()
+    user_url = f'https://{settings.AUTH0_DOMAIN}/userinfo'
+    payload = auth0.get(
+        user_url,
+        headers={'Authorization': f'Bearer {access_token}'},
+    ).json()
     # format payload key
     payload['username'] = payload.pop('sub')
     user = authenticate(request, **payload)
@@ -139,9 +208,12 @@ def logout(request):
 @login_required
 def account(request):
     user = request.user
-    recipient = getattr(user, 'recipient', None)
-    volunteer = getattr(user, 'volunteer', None)
-    assignment = getattr(volunteer, 'recipient', None) if volunteer else None
+    # Rows are only fetched if the cached fragment has to be rendered.
+    recipient = SimpleLazyObject(lambda: get_recipient(user))
+    volunteer = SimpleLazyObject(lambda: get_volunteer(user))
+    assignment = SimpleLazyObject(
+        lambda: volunteer.assignment if volunteer else None
+    )
     return render(
         request,
         'app/pages/account.html',
@@ -150,6 +222,9 @@ def account(request):
             'recipient': recipient,
             'volunteer': volunteer,
             'assignment': assignment,
+            'owner': user.pk,
+            'version': get_version(user.pk),
+            'timeout': FRAGMENT_TIMEOUT,
         }
     )
 
@@ -176,17 +251,19 @@ def account_delete(request):
 # Recipient
 @login_required
 def recipient(request):
-    try:
-        recipient = request.user.recipient
-    except AttributeError:
+    user = request.user
+    version = get_version(user.pk)
+    recipient = SimpleLazyObject(lambda: get_recipient(user))
+    if not is_cached('recipient', user.pk, version) and not recipient:
         return redirect('recipient-create')
-    assignments = getattr(recipient, 'assignments', None)
     return render(
         request,
         'app/pages/recipient.html',
         context={
             'recipient': recipient,
-            'assignments': assignments,
+            'owner': user.pk,
+            'version': version,
+            'timeout': FRAGMENT_TIMEOUT,
         }
     )
 
@@ -206,7 +283,9 @@ def recipient_create(request):
         recipient = form.save(commit=False)
         recipient.user = request.user
         recipient.save()
-        send_recipient_confirmation.delay(recipient)
+        transaction.on_commit(
+            lambda: send_recipient_confirmation.delay(str(recipient.pk))
+        )
         messages.success(
             request,
             "Registration complete!  We will reach out before November 8th with futher details.",
@@ -266,17 +345,21 @@ def recipient_delete(request):
 # Volunteer
 @login_required
 def volunteer(request):
-    try:
-        volunteer = request.user.volunteer
-    except AttributeError:
+    user = request.user
+    version = get_version(user.pk)
+    volunteer = SimpleLazyObject(lambda: get_volunteer(user))
+    if not is_cached('volunteer', user.pk, version) and not volunteer:
         return redirect('volunteer-create')
-    assignment = getattr(volunteer, 'assignment', None)
+    assignment = SimpleLazyObject(lambda: volunteer.assignment)
     return render(
         request,
         'app/pages/volunteer.html',
         context={
             'volunteer': volunteer,
             'assignment': assignment,
+            'owner': user.pk,
+            'version': version,
+            'timeout': FRAGMENT_TIMEOUT,
         }
     )
 
@@ -295,7 +378,9 @@ def volunteer_create(request):
         volunteer = form.save(commit=False)
         volunteer.user = request.user
         volunteer.save()
-        send_volunteer_confirmation.delay(volunteer)
+        transaction.on_commit(
+            lambda: send_volunteer_confirmation.delay(str(volunteer.pk))
+        )
         messages.success(
             request,
             "Signup complete!  We will reach out before November 8th with futher details.",
@@ -353,44 +438,115 @@ def volunteer_delete(request):
 
 
 # Admin
-@staff_member_required
-def dashboard(request):
-    volunteers = Volunteer.objects.order_by(
+DASHBOARD_PAGE_SIZE = 100
+
+def get_dashboard_volunteers(form, after=None):
+    """
+    Returns the volunteers the dashboard lists for a bound filter form,
+    from after the signed sort key `after` if given.
+    """
+    volunteers = Volunteer.objects.select_related(
+        'assignment',
+    ).order_by(
         'last_name',
         'first_name',
+        'id',
     )
+    if form.is_valid():
+        if form.cleaned_data['q']:
+            volunteers = match(
+                volunteers,
+                form.cleaned_data['q'],
+                ['name', 'email', 'phone'],
+            )
+        status = form.cleaned_data['status']
+        if status:
+            volunteers = volunteers.filter(
+                assignment__isnull=status == 'unassigned',
+            )
+        if form.cleaned_data['size']:
+            volunteers = volunteers.filter(size=form.cleaned_data['size'])
+    if after:
+        try:
+            last_name, first_name, pk = signing.loads(after, salt='dashboard')
+        except signing.BadSignature:
+            raise Http404
+        volunteers = volunteers.filter(
+            Q(last_name__gt=last_name) |
+            Q(last_name=last_name, first_name__gt=first_name) |
+            Q(last_name=last_name, first_name=first_name, id__gt=pk)
+        )
+    return volunteers
+
+@staff_member_required
+def dashboard(request):
+    """
+    Lists volunteers by name a page at a time.
+
+    Pages are keyset paginated: each links to the next by the sort key
+    of its last row, so later pages cost the same as the first.
+    """
+    form = DashboardForm(request.GET)
+    params = request.GET.copy()
+    after = params.pop('after', [None])[0]
+    volunteers = get_dashboard_volunteers(form, after)
+    volunteers = list(volunteers[:DASHBOARD_PAGE_SIZE + 1])
+    next_query = None
+    if len(volunteers) > DASHBOARD_PAGE_SIZE:
+        volunteers = volunteers[:DASHBOARD_PAGE_SIZE]
+        last = volunteers[-1]
+        params['after'] = signing.dumps(
+            [last.last_name, last.first_name, str(last.pk)],
+            salt='dashboard',
+        )
+        next_query = params.urlencode()
+        del params['after']
     return render(
         request,
         'app/pages/dashboard.html',
-        {'volunteers': volunteers},
+        {
+            'form': form,
+            'volunteers': volunteers,
+            'first_query': params.urlencode() if after else None,
+            'next_query': next_query,
+        },
     )
 
 @staff_member_required
 def dashboard_volunteer(request, volunteer_id):
-    volunteer = Volunteer.objects.get(pk=volunteer_id)
+    volunteer = get_object_or_404(
+        Volunteer.objects.select_related(
+            'assignment__address__locality__state__country',
+        ),
+        pk=volunteer_id,
+    )
+    assignment = volunteer.assignment
+    # Keyed on the rows themselves, not the staff member viewing them.
+    version = '-'.join(
+        str(obj.updated.timestamp()) for obj in (volunteer, assignment) if obj
+    )
     return render(
         request,
         'app/pages/volunteer.html',
-        {'volunteer': volunteer},
+        {
+            'volunteer': volunteer,
+            'assignment': assignment,
+            'owner': f'volunteer:{volunteer.pk}',
+            'version': version,
+            'timeout': FRAGMENT_TIMEOUT,
+        },
     )
 
-
 @staff_member_required
 def handout_pdf(request, volunteer_id):
-    volunteer = get_object_or_404(Volunteer, pk=volunteer_id)
-    context={
-        'volunteer': volunteer,
-        'recipient': volunteer.recipient,
-        'map': map,
-    }
-    rendered = render_to_string('app/pages/handout.html', context)
-    pdf = pydf.generate_pdf(
-        rendered,
-        enable_smart_shrinking=False,
-        orientation='Portrait',
-        margin_top='10mm',
-        margin_bottom='10mm',
+    volunteer = get_object_or_404(
+        Volunteer.objects.select_related(
+            'assignment__address__locality__state__country',
+        ),
+        pk=volunteer_id,
     )
+    rendered = render_handout(volunteer)
+    pdf = get_handout_pdf(rendered)
     content = ContentFile(pdf)
     return FileResponse(
         content,
@@ -399,65 +555,109 @@ def handout_pdf(request, volunteer_id):
     )
 
 @staff_member_required
-def handout_pdfs(request):
-    volunteers = Volunteer.objects.order_by(
-        'last',
-        'first',
-    )
-    output = ''
-    for volunteer in volunteers:
-        context={
-            'volunteer': volunteer,
-            'recipient': volunteer.recipient,
-            'map': map,
-        }
-        rendered = render_to_string('app/pages/handout.html', context)
-        output += "<br>"+rendered
-    pdf = pydf.generate_pdf(
-        output,
-        enable_smart_shrinking=False,
-        orientation='Portrait',
-        margin_top='10mm',
-        margin_bottom='10mm',
+def handouts(request):
+    if request.method == "POST":
+        job = build_handouts.delay()
+        request.session['handouts_job'] = job.id
+        messages.success(
+            request,
+            "Generating handouts; this page will update when they are ready.",
+        )
+        return redirect('handouts')
+    job_id = request.session.get('handouts_job')
+    job = get_queue().fetch_job(job_id) if job_id else None
+    return render(
+        request,
+        'app/pages/handouts.html',
+        {'job': job},
     )
-    content = ContentFile(pdf)
+
+@staff_member_required
+def handouts_pdf(request, job_id):
+    job = get_queue().fetch_job(job_id)
+    if not job or not job.is_finished:
+        raise Http404
+    # A later build deletes this one's PDF.
+    try:
+        pdf = default_storage.open(job.result)
+    except OSError:
+        raise Http404
     return FileResponse(
-        content,
+        pdf,
         as_attachment=True,
         filename='handouts.pdf',
     )
 
 @staff_member_required
-def export_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="export.csv"'
-    vs = Volunteer.objects.order_by(
-        'last',
-        'first',
+def export_csv(request, kind):
+    if kind not in EXPORTS:
+        raise Http404
+    response = StreamingHttpResponse(
+        export_rows(kind),
+        content_type='text/csv',
     )
-
-    writer = csv.writer(response)
-    writer.writerow([
-        'Volunteer',
-        'Phone',
-        'Number',
-        'Recipient',
-        'Address',
-        'Phone',
-        'Email',
-        'Dog',
-        'Size',
-    ])
-    for v in vs:
-        writer.writerow([
-            v.name,
-            v.phone,
-            v.number,
-            v.recipient.name,
-            v.recipient.address,
-            v.recipient.phone,
-            v.recipient.email,
-            v.recipient.is_dog,
-            v.recipient.get_size_display(),
-        ])
+    response['Content-Disposition'] = f'attachment; filename="{kind}.csv"'
     return response
+
+@staff_member_required
+def import_sheet(request, kind):
+    if kind not in IMPORTS:
+        raise Http404
+    key = f'import_job:{kind}'
+    form = ImportForm(request.POST or None, request.FILES or None)
+    if form.is_valid():
+        # The job streams the upload from storage rather than taking
+        # its bytes in the job payload.
+        upload = form.cleaned_data['file']
+        name = get_upload_storage().save(f'uploads/{upload.name}', upload)
+        job = import_file.delay(kind, name)
+        request.session[key] = job.id
+        messages.success(
+            request,
+            "Importing; this page will update as rows are saved.",
+        )
+        return redirect('import-sheet', kind)
+    job_id = request.session.get(key)
+    job = get_queue().fetch_job(job_id) if job_id else None
+    if job and job.is_finished:
+        report = job.result
+    elif job:
+        report = job.meta.get('progress')
+    else:
+        report = None
+    return render(
+        request,
+        'app/pages/import.html',
+        {
+            'kind': kind,
+            'form': form,
+            'job': job,
+            'report': report,
+        },
+    )
+
+@staff_member_required
+def photos(request):
+    form = PhotosForm(request.POST or None, request.FILES or None)
+    if form.is_valid():
+        # Workers can't see this dyno's disk, so the upload goes to
+        # storage for the job to read.
+        upload = form.cleaned_data['file']
+        name = get_upload_storage().save(f'uploads/{upload.name}', upload)
+        job = ingest_upload.delay(name)
+        request.session['photos_job'] = job.id
+        messages.success(
+            request,
+            "Adding photos; this page will update when they are in.",
+        )
+        return redirect('photos')
+    job_id = request.session.get('photos_job')
+    job = get_queue().fetch_job(job_id) if job_id else None
+    return render(
+        request,
+        'app/pages/photos.html',
+        {
+            'form': form,
+            'job': job,
+        },
+    )
@@ -0,0 +1,38 @@
+# Django
+from django.contrib.admin.widgets import AutocompleteSelect
+
+# Local
+from .assign import get_demand
+
+
+def label_recipient(recipient):
+    needed = max(get_demand(recipient) - recipient.head_count, 0)
+    return f'{recipient.name} ({needed} more needed)'
+
+
+class AssignmentSelect(AutocompleteSelect):
+    """
+    Recipient autocomplete labelled with the headcount still needed.
+
+    Set `recipient` to the row's current assignment, already joined by
+    the changelist, and it is rendered as the selected option without
+    the query per row the stock widget makes.
+    """
+    recipient = None
+
+    def optgroups(self, name, value, attr=None):
+        recipient = self.recipient
+        selected = {str(v) for v in value} - {''}
+        if recipient is None or selected != {str(recipient.pk)}:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        options.append(self.create_option(
+            name,
+            recipient.pk,
+            label_recipient(recipient),
+            True,
+            len(options),
+        ))
+        return [(None, options, 0)]
@@ -13,6 +13,8 @@ env = Env(
     REDIS_URL=(str, 'redis://localhost:6379/0'),
     LOGLEVEL=(str, 'INFO'),
     ACTIVE=(bool, False),
+    HEROKU_SLUG_COMMIT=(str, ''),
+    ASSIGNMENT_ORIGIN=((float,), (43.6955, -116.3497)),
 )
 
 root = Path(__file__) - 2
@@ -40,6 +42,12 @@ HASHID_FIELD_SALT = env("HASHID_FIELD_SALT")
 # Application Active Flag
 ACTIVE = env("ACTIVE")
 
+# Deployed commit, set by Heroku's dyno metadata
+RELEASE = env("HEROKU_SLUG_COMMIT")
+
+# Assignment starting point for groups without an address, as "latitude,longitude"
+ASSIGNMENT_ORIGIN = env("ASSIGNMENT_ORIGIN")
+
 # Authentication
 AUTH_USER_MODEL = 'app.User'
 AUTHENTICATION_BACKENDS = [
@@ -101,6 +109,9 @@ STATIC_URL = '/static/'
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 MEDIA_ROOT = root('mediafiles')
 MEDIA_URL = '/media/'
+# Cloudinary's media storage only takes images, so uploaded sheets and
+# archives handed to jobs are stored as raw files.
+UPLOAD_FILE_STORAGE = 'cloudinary_storage.storage.RawMediaCloudinaryStorage'
 CLOUDINARY_URL = env("CLOUDINARY_URL")
 
 # Google